@@ -20,9 +20,11 @@ def test_scene_splits(test_videos_dir, golden):
     end_time = golden.get("end_time", 0) or None
 
     # Apply test limit if set
+    duration = None
     if TEST_LIMIT > 0:
         if end_time is None:
-            end_time = get_video_duration(video_path)
+            duration = get_video_duration(video_path)
+            end_time = duration
         end_time = min(end_time, start_time + TEST_LIMIT)
 
     result = detect_cuts(
@@ -31,6 +33,7 @@ def test_scene_splits(test_videos_dir, golden):
         end_time=end_time,
         min_confidence=params.get("min_confidence", 12),
         min_gap=params.get("min_gap", 1.0),
+        duration=duration,
     )
 
     actual_cuts = [c.time for c in result.cuts]
@@ -0,0 +1,94 @@
+"""Tests for the gallery server."""
+
+import time
+
+from fastapi.testclient import TestClient
+
+from videocatalog import server
+
+
+def test_index_survives_failed_regeneration(tmp_path, monkeypatch):
+    """A failing background regeneration is logged and doesn't break later page loads."""
+    (tmp_path / "video").mkdir()
+    (tmp_path / "gallery.html").write_text("<html></html>")
+
+    def failing_generate(output_dir):
+        raise RuntimeError("template error")
+
+    monkeypatch.setattr(server, "generate_gallery", failing_generate)
+    monkeypatch.setattr(server, "GALLERY_REGEN_DELAY", 0.01)
+
+    with TestClient(server.create_app(tmp_path)) as client:
+        assert client.put("/api/edits/video", json={}).status_code == 200
+        deadline = time.monotonic() + 5
+        while getattr(server.app.state, "regen_task", None) is not None:
+            assert time.monotonic() < deadline, "regeneration task never finished"
+            time.sleep(0.01)
+
+        for _ in range(3):
+            response = client.get("/")
+            assert response.status_code == 200
+            assert response.text == "<html></html>"
+
+
+def test_video_file_conditional_and_containment(tmp_path):
+    """Video files answer conditional requests with 304 and stay inside their directory."""
+    (tmp_path / "video").mkdir()
+    (tmp_path / "video" / "clip.mp4").write_bytes(b"0123456789")
+    (tmp_path / "secret.txt").write_text("secret")
+
+    client = TestClient(server.create_app(tmp_path))
+    response = client.get("/video/clip.mp4")
+    assert response.status_code == 200
+    assert response.content == b"0123456789"
+
+    etag = response.headers["etag"]
+    assert client.get("/video/clip.mp4", headers={"If-None-Match": etag}).status_code == 304
+    last_modified = response.headers["last-modified"]
+    not_modified = client.get("/video/clip.mp4", headers={"If-Modified-Since": last_modified})
+    assert not_modified.status_code == 304
+    assert client.get("/video/clip.mp4", headers={"If-None-Match": '"other"'}).status_code == 200
+
+    assert client.get("/video/%2e%2e/secret.txt").status_code == 404
+    assert client.get("/video/missing.mp4").status_code == 404
+
+
+def test_create_app_switching_directories(tmp_path):
+    """Video names found in one output directory aren't trusted for another."""
+    first, second = tmp_path / "first", tmp_path / "second"
+    (first / "only_in_first").mkdir(parents=True)
+    (second / "only_in_second").mkdir(parents=True)
+
+    server.create_app(first)
+    client = TestClient(server.create_app(second))
+    assert client.put("/api/edits/only_in_first", json={}).status_code == 404
+    assert client.get("/api/edits/only_in_second").status_code == 200
+
+
+def test_index_serves_gallery_rewritten_by_another_process(tmp_path):
+    """A gallery.html rewritten outside the server is served with matching headers."""
+    gallery = tmp_path / "gallery.html"
+    gallery.write_text("<html>old</html>")
+
+    client = TestClient(server.create_app(tmp_path))
+    first = client.get("/")
+    assert first.status_code == 200
+    assert first.text == "<html>old</html>"
+
+    gallery.write_text("<html>rewritten by the gallery command</html>")
+    second = client.get("/")
+    assert second.status_code == 200
+    assert second.text == "<html>rewritten by the gallery command</html>"
+    assert second.headers["content-length"] == str(len(second.content))
+    assert second.headers["etag"] != first.headers["etag"]
+
+
+def test_save_edits_for_deleted_video_dir(tmp_path):
+    """Saving edits for a video directory removed after startup answers 404, not 500."""
+    video_dir = tmp_path / "video"
+    video_dir.mkdir()
+
+    client = TestClient(server.create_app(tmp_path))
+    video_dir.rmdir()
+    assert client.put("/api/edits/video", json={}).status_code == 404
+    assert "video" not in server.app.state.video_names
@@ -2,7 +2,6 @@
 
 import argparse
 import io
-import multiprocessing
 import os
 import shutil
 import sys
@@ -26,8 +25,8 @@ from .models import (
 )
 from .preprocess import preprocess_dv_file, preprocess_film_scan
 from .processing import convert_to_mp4, process_clips
-from .splitting import split_video
-from .transcription import extract_audio, transcribe_from_wav, transcribe_worker
+from .splitting import KEYFRAME_SNAP_TOLERANCE, split_video
+from .transcription import transcribe_clips
 from .utils import (
     format_time,
     get_default_workers,
@@ -72,6 +71,7 @@ def run_detection_with_logging(
     min_confidence: int,
     min_gap: float,
     verbose: bool,
+    duration: float | None = None,
 ):
     """Run cut detection and write detailed logs. Returns (result, cuts, all_candidates)."""
 
@@ -94,6 +94,7 @@ def run_detection_with_logging(
         min_gap=min_gap,
         verbose=verbose,
         log_file=log_file,
+        duration=duration,
     )
     cuts = result.cuts
     all_candidates = result.all_candidates
@@ -238,6 +239,7 @@ def cmd_process(args):
             args.min_confidence,
             args.min_gap,
             args.verbose,
+            duration=full_duration,
         )
         duration = end_time
 
@@ -249,7 +251,15 @@ def cmd_process(args):
             return
 
         log(f"Splitting to: {video_subdir}")
-        output_files = split_video(args.input, video_subdir, cuts, duration, log=log)
+        output_files = split_video(
+            args.input,
+            video_subdir,
+            cuts,
+            duration,
+            log=log,
+            no_reencode=args.no_reencode,
+            max_snap=args.max_snap,
+        )
         log("")
 
         # Save splits.json with all detection data
@@ -401,41 +411,7 @@ def cmd_transcribe(args):
         if not to_transcribe:
             print("  All files already transcribed")
         else:
-            # Phase 1: Extract audio in parallel
-            print(f"  Extracting audio for {len(to_transcribe)} files...")
-            wav_map = {}
-            with ThreadPoolExecutor(max_workers=ffmpeg_workers) as executor:
-                futures = {executor.submit(extract_audio, f): f for f in to_transcribe}
-                for future in as_completed(futures):
-                    mp4 = futures[future]
-                    try:
-                        wav_map[mp4] = future.result()
-                    except Exception as e:
-                        print(f"    Error extracting audio for {mp4.name}: {e}")
-
-            # Phase 2: Transcribe (parallel if workers > 1)
-            print(f"  Transcribing {len(wav_map)} files ({transcribe_workers} workers)...")
-            try:
-                if transcribe_workers == 1:
-                    for i, (mp4, wav) in enumerate(wav_map.items(), 1):
-                        print(f"    [{i}/{len(wav_map)}] {mp4.name}")
-                        transcribe_from_wav(mp4, wav)
-                else:
-                    work_items = [(str(mp4), str(wav)) for mp4, wav in wav_map.items()]
-                    ctx = multiprocessing.get_context("spawn")
-                    pool = ctx.Pool(processes=transcribe_workers)
-                    try:
-                        for i, (video_path_str, _) in enumerate(
-                            pool.imap_unordered(transcribe_worker, work_items), 1
-                        ):
-                            print(f"    [{i}/{len(wav_map)}] {Path(video_path_str).name}")
-                    finally:
-                        pool.close()
-                        pool.join()
-            except Exception:
-                for wav in wav_map.values():
-                    wav.unlink(missing_ok=True)
-                raise
+            transcribe_clips(to_transcribe, ffmpeg_workers, transcribe_workers)
 
         metadata_path = subdir / "metadata.json"
         if metadata_path.exists():
@@ -494,7 +470,7 @@ def cmd_frames(args):
         "2",
         str(temp_pattern),
     ]
-    result = run_ffmpeg(cmd)
+    result = run_ffmpeg(cmd, quiet=True)
     if result.returncode != 0:
         print(f"Error extracting frames: {result.stderr}", file=sys.stderr)
         sys.exit(1)
@@ -563,6 +539,17 @@ def main():
         "--force", action="store_true", help="Force reprocessing even if already processed"
     )
     p_process.add_argument("--skip-transcribe", action="store_true", help="Skip transcription step")
+    p_process.add_argument(
+        "--no-reencode",
+        action="store_true",
+        help="Stream-copy segments whose cuts fall on keyframes (skips deinterlace/denoise)",
+    )
+    p_process.add_argument(
+        "--max-snap",
+        type=float,
+        default=KEYFRAME_SNAP_TOLERANCE,
+        help=f"Max seconds a cut may move to a keyframe with --no-reencode (default: {KEYFRAME_SNAP_TOLERANCE})",
+    )
     p_process.add_argument(
         "--workers",
         type=int,
@@ -1,16 +1,101 @@
 """Cut detection: scene changes, black frames, audio changes, and verification."""
 
+import asyncio
+import bisect
 import os
 import re
 import subprocess
-import tempfile
-from collections import Counter, defaultdict
+from collections import defaultdict
 from pathlib import Path
 from typing import Literal, overload
 
+import numpy as np
+
 from .models import CutCandidate, CutDetectionResult, NoiseZone
 from .utils import format_time, get_video_duration
 
+# Frame size for flash-detection histograms
+SMALL_FRAME_W, SMALL_FRAME_H = 160, 90
+
+# Patterns for ffmpeg filter output, matched line by line against raw (undecoded) bytes
+_SCD_RE = re.compile(rb"lavfi\.scd\.score:\s*([\d.]+),\s*lavfi\.scd\.time:\s*([\d.]+)")
+_BLACK_RE = re.compile(rb"black_start:([\d.]+)\s+black_end:([\d.]+)\s+black_duration:([\d.]+)")
+# ametadata prints "pts_time:N" then the RMS key on the next line; only whole-second frames
+_PTS_RE = re.compile(rb"pts_time:(\d+)\s*$")
+_RMS_LEVEL_RE = re.compile(rb"RMS_level=([-\d.inf]+)")
+
+# Per-second RMS levels, printed to the ffmpeg log by ametadata
+RMS_FILTER = (
+    "asetnsamples=n=48000,astats=metadata=1:reset=1,"
+    "ametadata=print:key=lavfi.astats.Overall.RMS_level"
+)
+
+
+def _seek_args(limit: float, start_time: float, end_time: float) -> list[str]:
+    """ffmpeg input options limiting decoding to [start_time, end_time)."""
+    args = []
+    if start_time > 0:
+        args += ["-ss", str(start_time)]
+    duration = end_time - start_time if end_time > 0 else limit
+    if duration > 0:
+        args += ["-t", str(duration)]
+    return args
+
+
+def _scan_detections(
+    cmd: list[str], start_time: float
+) -> tuple[int, list[tuple[float, float]], list[tuple[float, float]], dict[int, float]]:
+    """Run an ffmpeg detection pass, matching scdet/blackdetect/RMS lines as they arrive.
+
+    stderr is consumed line by line while ffmpeg decodes, so parsing overlaps the
+    decode and the full log is never held in memory.
+
+    Returns:
+        (returncode, scenes, blacks, rms) with times converted to absolute time
+    """
+    scenes = []
+    blacks = []
+    rms = {}
+    pts = None  # whole-second pts_time awaiting its RMS line
+    with subprocess.Popen(
+        cmd, stdin=subprocess.DEVNULL, stdout=subprocess.DEVNULL, stderr=subprocess.PIPE
+    ) as proc:
+        assert proc.stderr is not None
+        for line in proc.stderr:
+            if pts is not None:
+                if match := _RMS_LEVEL_RE.search(line):
+                    level_str = match.group(1)
+                    if level_str != b"-inf" and level_str != b"-":
+                        rms[pts] = float(level_str)
+                pts = None
+            if match := _PTS_RE.search(line):
+                pts = int(match.group(1)) + int(start_time)  # Convert to absolute time
+            elif match := _SCD_RE.search(line):
+                score = float(match.group(1))
+                time = float(match.group(2)) + start_time  # Convert to absolute time
+                if score >= 5:
+                    scenes.append((time, score))
+            elif match := _BLACK_RE.search(line):
+                black_end = float(match.group(2)) + start_time  # Convert to absolute time
+                black_duration = float(match.group(3))
+                if black_duration >= 0.1:
+                    blacks.append((black_end, black_duration))
+    return proc.returncode, scenes, blacks, rms
+
+
+def _audio_level_changes(rms: dict[int, float]) -> dict[int, float]:
+    """Return steps > 5 dB between consecutive per-second RMS levels."""
+    changes = {}
+    sorted_times = sorted(rms.keys())
+    for i in range(1, len(sorted_times)):
+        t = sorted_times[i]
+        prev_t = sorted_times[i - 1]
+        step = abs(rms[t] - rms[prev_t])
+        if step > 5:
+            changes[t] = step
+
+    return changes
+
 
 def detect_scenes(
     video_path: Path, limit: float = 0, start_time: float = 0, end_time: float = 0
@@ -24,23 +109,9 @@ def detect_scenes(
         end_time: End time in seconds (0 = full video)
     """
     print("  Detecting scene changes...")
-    cmd = ["ffmpeg"]
-    if start_time > 0:
-        cmd += ["-ss", str(start_time)]
-    duration = end_time - start_time if end_time > 0 else limit
-    if duration > 0:
-        cmd += ["-t", str(duration)]
+    cmd = ["ffmpeg", "-nostats", *_seek_args(limit, start_time, end_time)]
     cmd += ["-i", str(video_path), "-vf", "histeq,scdet=threshold=0.1", "-f", "null", "-"]
-    result = subprocess.run(cmd, capture_output=True, text=True)
-
-    pattern = r"lavfi\.scd\.score:\s*([\d.]+),\s*lavfi\.scd\.time:\s*([\d.]+)"
-    scenes = []
-    for match in re.finditer(pattern, result.stderr):
-        score = float(match.group(1))
-        time = float(match.group(2)) + start_time  # Convert to absolute time
-        if score >= 5:
-            scenes.append((time, score))
-
+    _, scenes, _, _ = _scan_detections(cmd, start_time)
     return scenes
 
 
@@ -56,23 +127,9 @@ def detect_black_frames(
         end_time: End time in seconds (0 = full video)
     """
     print("  Detecting black frames...")
-    cmd = ["ffmpeg"]
-    if start_time > 0:
-        cmd += ["-ss", str(start_time)]
-    duration = end_time - start_time if end_time > 0 else limit
-    if duration > 0:
-        cmd += ["-t", str(duration)]
+    cmd = ["ffmpeg", "-nostats", *_seek_args(limit, start_time, end_time)]
     cmd += ["-i", str(video_path), "-vf", "blackdetect=d=0.1:pix_th=0.10", "-an", "-f", "null", "-"]
-    result = subprocess.run(cmd, capture_output=True, text=True)
-
-    pattern = r"black_start:([\d.]+)\s+black_end:([\d.]+)\s+black_duration:([\d.]+)"
-    blacks = []
-    for match in re.finditer(pattern, result.stderr):
-        black_end = float(match.group(2)) + start_time  # Convert to absolute time
-        black_duration = float(match.group(3))
-        if black_duration >= 0.1:
-            blacks.append((black_end, black_duration))
-
+    _, _, blacks, _ = _scan_detections(cmd, start_time)
     return blacks
 
 
@@ -89,212 +146,181 @@ def detect_audio_changes(
         end_time: End time in seconds (0 = full video)
     """
     print("  Analyzing audio levels...")
-    rms_file = Path(tempfile.gettempdir()) / f"rms_analysis_{os.getpid()}.txt"
+    cmd = ["ffmpeg", "-nostats", *_seek_args(limit, start_time, end_time)]
+    cmd += ["-i", str(video_path), "-af", RMS_FILTER, "-f", "null", "-"]
+    _, _, _, rms = _scan_detections(cmd, start_time)
+    return _audio_level_changes(rms)
 
-    cmd = ["ffmpeg"]
-    if start_time > 0:
-        cmd += ["-ss", str(start_time)]
-    segment_duration = end_time - start_time if end_time > 0 else limit
-    if segment_duration > 0:
-        cmd += ["-t", str(segment_duration)]
+
+def detect_all_signals(
+    video_path: Path, duration: float, start_time: float = 0, end_time: float = 0
+) -> tuple[list[tuple[float, float]], list[tuple[float, float]], dict[int, float]]:
+    """Detect scene changes, black frames and audio changes in a single decode.
+
+    One ffmpeg run splits the decoded video into the scdet and blackdetect chains
+    and feeds the audio through the RMS chain, so the source is decoded once
+    instead of three times. Falls back to the separate detectors if the fused run
+    fails (e.g. input without an audio stream).
+
+    Args:
+        video_path: Path to video file
+        duration: Total video duration
+        start_time: Start time in seconds (seek before input for speed)
+        end_time: End time in seconds (0 = full video)
+
+    Returns:
+        (scenes, blacks, audio_changes) as from the individual detectors
+    """
+    print("  Detecting scene changes, black frames and audio levels...")
+    cmd = ["ffmpeg", "-nostats", *_seek_args(0, start_time, end_time)]
     cmd += [
         "-i",
         str(video_path),
-        "-af",
-        f"asetnsamples=n=48000,astats=metadata=1:reset=1,ametadata=print:key=lavfi.astats.Overall.RMS_level:file={rms_file}",
+        "-filter_complex",
+        "[0:v:0]split=2[sv][bv];"
+        "[sv]histeq,scdet=threshold=0.1[scd];"
+        "[bv]blackdetect=d=0.1:pix_th=0.10[bd];"
+        f"[0:a:0]{RMS_FILTER}[aud]",
+        "-map",
+        "[scd]",
+        "-f",
+        "null",
+        "-",
+        "-map",
+        "[bd]",
+        "-f",
+        "null",
+        "-",
+        "-map",
+        "[aud]",
         "-f",
         "null",
         "-",
     ]
-    subprocess.run(cmd, capture_output=True, text=True)
-
-    rms = {}
-    try:
-        if rms_file.exists():
-            content = rms_file.read_text()
-            pattern = r"pts_time:(\d+)\s*\n.*?RMS_level=([-\d.inf]+)"
-            for match in re.finditer(pattern, content):
-                t = int(match.group(1)) + int(start_time)  # Convert to absolute time
-                level_str = match.group(2)
-                if level_str == "-inf" or level_str == "-":
-                    continue
-                level = float(level_str)
-                rms[t] = level
-    finally:
-        rms_file.unlink(missing_ok=True)
-
-    changes = {}
-    sorted_times = sorted(rms.keys())
-    for i in range(1, len(sorted_times)):
-        t = sorted_times[i]
-        prev_t = sorted_times[i - 1]
-        step = abs(rms[t] - rms[prev_t])
-        if step > 5:
-            changes[t] = step
+    returncode, scenes, blacks, rms = _scan_detections(cmd, start_time)
+    if returncode != 0:
+        print("  Combined detection failed, running detectors separately")
+        return (
+            detect_scenes(video_path, start_time=start_time, end_time=end_time),
+            detect_black_frames(video_path, start_time=start_time, end_time=end_time),
+            detect_audio_changes(video_path, duration, start_time=start_time, end_time=end_time),
+        )
 
-    return changes
+    return scenes, blacks, _audio_level_changes(rms)
 
 
-def verify_scene_change(
-    video_path: Path, time: float, threshold: float = 0.7
-) -> tuple[bool, float]:
-    """Verify scene change by comparing color histograms before/after.
+async def _read_frame(
+    video_path: Path, time: float, sem: asyncio.Semaphore, small: bool = False
+) -> np.ndarray | None:
+    """Decode one frame at time through an ffmpeg pipe.
 
-    Uses histogram comparison which is robust to camera motion.
-    Returns (is_valid, similarity). A real scene change has low similarity.
-    A smooth transition (same scene) has high similarity.
+    Frames come back as BGR, either full-size (via PNG) or, with small, as a
+    SMALL_FRAME_W x SMALL_FRAME_H raw bgr24 frame. Returns None if no frame was decoded.
     """
     import cv2
 
-    before_time = max(0, time - 0.5)
-    after_time = time + 0.5
-
-    # Extract two frames to temp files
-    tmp_dir = Path(tempfile.gettempdir())
-    frame1 = tmp_dir / f"hist_before_{os.getpid()}.png"
-    frame2 = tmp_dir / f"hist_after_{os.getpid()}.png"
-
-    try:
-        # Extract frame before
-        subprocess.run(
-            [
-                "ffmpeg",
-                "-y",
-                "-ss",
-                str(before_time),
-                "-i",
-                str(video_path),
-                "-frames:v",
-                "1",
-                "-f",
-                "image2",
-                str(frame1),
-            ],
-            capture_output=True,
+    cmd = ["ffmpeg", "-ss", str(max(0, time)), "-i", str(video_path), "-frames:v", "1"]
+    if small:
+        cmd += [
+            "-s",
+            f"{SMALL_FRAME_W}x{SMALL_FRAME_H}",
+            "-pix_fmt",
+            "bgr24",
+            "-f",
+            "rawvideo",
+            "-",
+        ]
+    else:
+        cmd += ["-c:v", "png", "-f", "image2pipe", "-"]
+
+    async with sem:
+        proc = await asyncio.create_subprocess_exec(
+            *cmd,
+            stdin=asyncio.subprocess.DEVNULL,
+            stdout=asyncio.subprocess.PIPE,
+            stderr=asyncio.subprocess.DEVNULL,
         )
+        data, _ = await proc.communicate()
 
-        # Extract frame after
-        subprocess.run(
-            [
-                "ffmpeg",
-                "-y",
-                "-ss",
-                str(after_time),
-                "-i",
-                str(video_path),
-                "-frames:v",
-                "1",
-                "-f",
-                "image2",
-                str(frame2),
-            ],
-            capture_output=True,
-        )
+    if small:
+        if len(data) != SMALL_FRAME_W * SMALL_FRAME_H * 3:
+            return None
+        return np.frombuffer(data, dtype=np.uint8).reshape(SMALL_FRAME_H, SMALL_FRAME_W, 3)
+    if not data:
+        return None
+    return cv2.imdecode(np.frombuffer(data, dtype=np.uint8), cv2.IMREAD_COLOR)
 
-        if not frame1.exists() or not frame2.exists():
-            return True, 0.0
 
-        # Load images and convert to HSV
-        img1 = cv2.imread(str(frame1))
-        img2 = cv2.imread(str(frame2))
-        if img1 is None or img2 is None:
-            return True, 0.0
+async def _read_frame_pair(
+    video_path: Path,
+    before_time: float,
+    after_time: float,
+    sem: asyncio.Semaphore,
+    small: bool = False,
+) -> tuple[np.ndarray | None, np.ndarray | None]:
+    """Decode the frames at before_time and after_time concurrently."""
+    return await asyncio.gather(
+        _read_frame(video_path, before_time, sem, small),
+        _read_frame(video_path, after_time, sem, small),
+    )
 
-        hsv1 = cv2.cvtColor(img1, cv2.COLOR_BGR2HSV)
-        hsv2 = cv2.cvtColor(img2, cv2.COLOR_BGR2HSV)
 
-        # Calculate and normalize histograms
-        hist1 = cv2.calcHist([hsv1], [0, 1], None, [50, 60], [0, 180, 0, 256])
-        hist2 = cv2.calcHist([hsv2], [0, 1], None, [50, 60], [0, 180, 0, 256])
-        cv2.normalize(hist1, hist1)
-        cv2.normalize(hist2, hist2)
+def _hsv_similarity(img1: np.ndarray, img2: np.ndarray) -> float:
+    """Correlate H/S histograms of two BGR frames (1.0 = identical, 0 = no correlation)."""
+    import cv2
 
-        # Compare histograms (1.0 = identical, 0 = no correlation)
-        similarity = cv2.compareHist(hist1, hist2, cv2.HISTCMP_CORREL)
+    hsv1 = cv2.cvtColor(img1, cv2.COLOR_BGR2HSV)
+    hsv2 = cv2.cvtColor(img2, cv2.COLOR_BGR2HSV)
+    hist1 = cv2.calcHist([hsv1], [0, 1], None, [50, 60], [0, 180, 0, 256])
+    hist2 = cv2.calcHist([hsv2], [0, 1], None, [50, 60], [0, 180, 0, 256])
+    cv2.normalize(hist1, hist1)
+    cv2.normalize(hist2, hist2)
+    return cv2.compareHist(hist1, hist2, cv2.HISTCMP_CORREL)
 
-        # High similarity = same scene = should NOT cut (false positive)
-        # Low similarity = different scene = real cut
-        return similarity < threshold, similarity
 
-    finally:
-        frame1.unlink(missing_ok=True)
-        frame2.unlink(missing_ok=True)
+async def verify_scene_change(
+    video_path: Path, time: float, sem: asyncio.Semaphore, threshold: float = 0.7
+) -> tuple[bool, float]:
+    """Verify scene change by comparing color histograms before/after.
+
+    Uses histogram comparison which is robust to camera motion.
+    Returns (is_valid, similarity). A real scene change has low similarity.
+    A smooth transition (same scene) has high similarity.
+    """
+    img1, img2 = await _read_frame_pair(video_path, time - 0.5, time + 0.5, sem)
+    if img1 is None or img2 is None:
+        return True, 0.0
+
+    similarity = await asyncio.to_thread(_hsv_similarity, img1, img2)
+
+    # High similarity = same scene = should NOT cut (false positive)
+    # Low similarity = different scene = real cut
+    return similarity < threshold, similarity
 
 
-def check_scene_stability(
-    video_path: Path, time: float, threshold: float = 0.955
+async def check_scene_stability(
+    video_path: Path, time: float, sem: asyncio.Semaphore, threshold: float = 0.955
 ) -> tuple[bool, float, float]:
     """Check if distant frames before/after cut are similar (flash detection).
 
     Compares frames at ±0.5s and ±2s. If BOTH intervals show high similarity
-    (>=0.9), the cut is likely a flash/disturbance.
+    (>=0.9), the cut is likely a flash/disturbance. Frames are decoded
+    downscaled, but compared with the same H/S histogram the thresholds were
+    tuned for; histograms are normalized, so resolution barely moves them.
 
     Returns (is_flash, sim_1s, sim_2s).
     """
-    import cv2
-
-    def compare_frames(before_time: float, after_time: float) -> float:
-        tmp_dir = Path(tempfile.gettempdir())
-        frame1 = tmp_dir / f"stab_before_{os.getpid()}.png"
-        frame2 = tmp_dir / f"stab_after_{os.getpid()}.png"
-
-        try:
-            subprocess.run(
-                [
-                    "ffmpeg",
-                    "-y",
-                    "-ss",
-                    str(max(0, before_time)),
-                    "-i",
-                    str(video_path),
-                    "-frames:v",
-                    "1",
-                    "-f",
-                    "image2",
-                    str(frame1),
-                ],
-                capture_output=True,
-            )
-            subprocess.run(
-                [
-                    "ffmpeg",
-                    "-y",
-                    "-ss",
-                    str(after_time),
-                    "-i",
-                    str(video_path),
-                    "-frames:v",
-                    "1",
-                    "-f",
-                    "image2",
-                    str(frame2),
-                ],
-                capture_output=True,
-            )
 
-            if not frame1.exists() or not frame2.exists():
-                return 0.0
-
-            img1 = cv2.imread(str(frame1))
-            img2 = cv2.imread(str(frame2))
-            if img1 is None or img2 is None:
-                return 0.0
-
-            hsv1 = cv2.cvtColor(img1, cv2.COLOR_BGR2HSV)
-            hsv2 = cv2.cvtColor(img2, cv2.COLOR_BGR2HSV)
-            hist1 = cv2.calcHist([hsv1], [0, 1], None, [50, 60], [0, 180, 0, 256])
-            hist2 = cv2.calcHist([hsv2], [0, 1], None, [50, 60], [0, 180, 0, 256])
-            cv2.normalize(hist1, hist1)
-            cv2.normalize(hist2, hist2)
-
-            return cv2.compareHist(hist1, hist2, cv2.HISTCMP_CORREL)
-        finally:
-            frame1.unlink(missing_ok=True)
-            frame2.unlink(missing_ok=True)
+    async def compare_frames(before_time: float, after_time: float) -> float:
+        img1, img2 = await _read_frame_pair(video_path, before_time, after_time, sem, small=True)
+        if img1 is None or img2 is None:
+            return 0.0
+        return await asyncio.to_thread(_hsv_similarity, img1, img2)
 
     # Check at multiple intervals to catch both momentary flashes and sustained flickering
-    sim_short = compare_frames(time - 0.5, time + 0.5)
-    sim_long = compare_frames(time - 2.0, time + 2.0)
+    sim_short, sim_long = await asyncio.gather(
+        compare_frames(time - 0.5, time + 0.5), compare_frames(time - 2.0, time + 2.0)
+    )
 
     # Flash if EITHER interval is very high AND both are at least moderately high
     # This avoids filtering real cuts that have one high but one low interval
@@ -304,8 +330,8 @@ def check_scene_stability(
     return is_flash, sim_short, sim_long
 
 
-def check_side_stability(
-    video_path: Path, time: float, threshold: float = 0.7
+async def check_side_stability(
+    video_path: Path, time: float, sem: asyncio.Semaphore, threshold: float = 0.7
 ) -> tuple[bool, float, float]:
     """Check if at least one side of cut has stable/similar frames.
 
@@ -315,61 +341,26 @@ def check_side_stability(
 
     Returns (has_stable_side, sim_before, sim_after).
     """
-    import cv2
 
-    def compare_histogram(img1, img2) -> float:
+    async def compare_histogram(img1, img2) -> float:
         if img1 is None or img2 is None:
             return 0.0
-        hsv1 = cv2.cvtColor(img1, cv2.COLOR_BGR2HSV)
-        hsv2 = cv2.cvtColor(img2, cv2.COLOR_BGR2HSV)
-        hist1 = cv2.calcHist([hsv1], [0, 1], None, [50, 60], [0, 180, 0, 256])
-        hist2 = cv2.calcHist([hsv2], [0, 1], None, [50, 60], [0, 180, 0, 256])
-        cv2.normalize(hist1, hist1)
-        cv2.normalize(hist2, hist2)
-        return cv2.compareHist(hist1, hist2, cv2.HISTCMP_CORREL)
-
-    tmp_dir = Path(tempfile.gettempdir())
-    frames = {}
-    times = {
-        "before_far": max(0, time - 2.0),
-        "before_near": max(0, time - 0.5),
-        "after_near": time + 0.5,
-        "after_far": time + 2.0,
-    }
-
-    try:
-        for name, t in times.items():
-            path = tmp_dir / f"side_{name}_{os.getpid()}.png"
-            subprocess.run(
-                [
-                    "ffmpeg",
-                    "-y",
-                    "-ss",
-                    str(t),
-                    "-i",
-                    str(video_path),
-                    "-frames:v",
-                    "1",
-                    "-f",
-                    "image2",
-                    str(path),
-                ],
-                capture_output=True,
-            )
-            frames[name] = cv2.imread(str(path)) if path.exists() else None
+        return await asyncio.to_thread(_hsv_similarity, img1, img2)
 
-        # Compare frames on each side
-        sim_before = compare_histogram(frames["before_far"], frames["before_near"])
-        sim_after = compare_histogram(frames["after_near"], frames["after_far"])
+    before_far, before_near, after_near, after_far = await asyncio.gather(
+        _read_frame(video_path, time - 2.0, sem),
+        _read_frame(video_path, time - 0.5, sem),
+        _read_frame(video_path, time + 0.5, sem),
+        _read_frame(video_path, time + 2.0, sem),
+    )
 
-        # At least one side should be stable for a real cut
-        has_stable_side = sim_before >= threshold or sim_after >= threshold
-        return has_stable_side, sim_before, sim_after
+    # Compare frames on each side
+    sim_before = await compare_histogram(before_far, before_near)
+    sim_after = await compare_histogram(after_near, after_far)
 
-    finally:
-        for name in times:
-            path = tmp_dir / f"side_{name}_{os.getpid()}.png"
-            path.unlink(missing_ok=True)
+    # At least one side should be stable for a real cut
+    has_stable_side = sim_before >= threshold or sim_after >= threshold
+    return has_stable_side, sim_before, sim_after
 
 
 def is_near_noise_zone(
@@ -396,6 +387,9 @@ def verify_candidates(
     - Near noise zones: histogram verification required
     - Audio corroboration: side stability + flash check (catches camera motion)
     - Scene-only: histogram + stability checks
+
+    Candidates are verified concurrently; frame extraction runs as async ffmpeg
+    subprocesses capped at one per CPU, histogram math runs in worker threads.
     """
 
     def log(msg: str):
@@ -404,63 +398,55 @@ def verify_candidates(
         if log_file:
             log_file.write(msg + "\n")
 
-    log(f"  Verifying {len(candidates)} candidates with histogram comparison...")
-
-    verified = []
-    for c in candidates:
+    async def verify_one(c: CutCandidate, sem: asyncio.Semaphore) -> tuple[bool, str]:
+        """Return (passed, log line) for a single candidate."""
         max_score = scene_max_scores.get(int(c.time), 0)
         has_black = c.black_duration >= 0.2
         has_audio = c.audio_step >= 5
         near_noise = is_near_noise_zone(c.time, noise_zones)
+        prefix = f"    {format_time(c.time)} max={max_score:.1f}"
 
         # Black frame = strong signal, skip all checks
         if has_black:
-            log(f"    {format_time(c.time)} max={max_score:.1f} -> PASS (black frame)")
-            verified.append(c)
-            continue
+            return True, f"{prefix} -> PASS (black frame)"
 
         # Near noise zones: apply histogram verification (catches VHS static)
         if near_noise:
-            is_valid, similarity = verify_scene_change(video_path, c.time, threshold)
+            is_valid, similarity = await verify_scene_change(video_path, c.time, sem, threshold)
             if not is_valid:
-                log(
-                    f"    {format_time(c.time)} max={max_score:.1f} hist={similarity:.3f} -> FAIL (noise zone)"
-                )
-                continue
+                return False, f"{prefix} hist={similarity:.3f} -> FAIL (noise zone)"
 
         # Audio corroboration: pass without histogram check, just flash check
         if has_audio:
-            is_flash, sim_short, sim_long = check_scene_stability(video_path, c.time)
+            is_flash, sim_short, sim_long = await check_scene_stability(video_path, c.time, sem)
             if is_flash:
-                log(
-                    f"    {format_time(c.time)} max={max_score:.1f} stab={sim_short:.2f}/{sim_long:.2f} -> FAIL (flash)"
-                )
-                continue
-            log(f"    {format_time(c.time)} max={max_score:.1f} -> PASS (audio)")
-            verified.append(c)
-            continue
+                return False, f"{prefix} stab={sim_short:.2f}/{sim_long:.2f} -> FAIL (flash)"
+            return True, f"{prefix} -> PASS (audio)"
 
         # Borderline scene-only detections need histogram check
         if max_score < 10:
-            is_valid, similarity = verify_scene_change(video_path, c.time, threshold)
+            is_valid, similarity = await verify_scene_change(video_path, c.time, sem, threshold)
             if not is_valid:
-                log(
-                    f"    {format_time(c.time)} max={max_score:.1f} hist={similarity:.3f} -> FAIL (same scene)"
-                )
-                continue
+                return False, f"{prefix} hist={similarity:.3f} -> FAIL (same scene)"
 
         # Flash detection for scene-only candidates
-        is_flash, sim_short, sim_long = check_scene_stability(video_path, c.time)
+        is_flash, sim_short, sim_long = await check_scene_stability(video_path, c.time, sem)
         if is_flash:
-            log(
-                f"    {format_time(c.time)} max={max_score:.1f} stab={sim_short:.2f}/{sim_long:.2f} -> FAIL (flash)"
-            )
-            continue
+            return False, f"{prefix} stab={sim_short:.2f}/{sim_long:.2f} -> FAIL (flash)"
 
-        log(
-            f"    {format_time(c.time)} max={max_score:.1f} stab={sim_short:.2f}/{sim_long:.2f} -> PASS"
-        )
-        verified.append(c)
+        return True, f"{prefix} stab={sim_short:.2f}/{sim_long:.2f} -> PASS"
+
+    async def verify_all() -> list[tuple[bool, str]]:
+        sem = asyncio.Semaphore(os.cpu_count() or 4)
+        return await asyncio.gather(*(verify_one(c, sem) for c in candidates))
+
+    log(f"  Verifying {len(candidates)} candidates with histogram comparison...")
+
+    verified = []
+    for c, (passed, msg) in zip(candidates, asyncio.run(verify_all()), strict=True):
+        log(msg)
+        if passed:
+            verified.append(c)
 
     log(f"  Verified: {len(verified)}/{len(candidates)} candidates passed")
 
@@ -489,26 +475,25 @@ def detect_noise_zones(
     if not scenes:
         return []
 
-    detections_per_sec = Counter(int(t) for t, _ in scenes)
+    # Detections per second, indexed by int(time)
+    secs = np.fromiter((int(t) for t, _ in scenes), dtype=np.int64, count=len(scenes))
+    counts = np.bincount(secs)
+    min_t = int(secs.min())
 
-    if not detections_per_sec:
+    # Sliding window: find seconds where average density exceeds threshold.
+    # window_totals[t] is the detection count over [t, t + window_size).
+    if len(counts) < window_size:
         return []
-
-    # Get time range
-    min_t = min(detections_per_sec.keys())
-    max_t = max(detections_per_sec.keys())
-
-    # Sliding window: find seconds where average density exceeds threshold
-    high_density_secs = []
-    for t in range(min_t, max_t - window_size + 2):
-        window_total = sum(detections_per_sec.get(t + i, 0) for i in range(window_size))
-        avg = window_total / window_size
-        if avg >= avg_threshold:
-            high_density_secs.append(t)
+    window_totals = np.convolve(counts, np.ones(window_size, dtype=np.int64), mode="valid")
+    high_density = np.flatnonzero(window_totals / window_size >= avg_threshold)
+    high_density_secs = high_density[high_density >= min_t].tolist()
 
     if not high_density_secs:
         return []
 
+    def zone_count(start: int, duration: int) -> int:
+        return int(counts[start : start + duration].sum())
+
     # Group consecutive seconds into zones
     zones: list[NoiseZone] = []
     zone_start = high_density_secs[0]
@@ -520,11 +505,12 @@ def detect_noise_zones(
         else:
             zone_duration = zone_end - zone_start + window_size
             if zone_duration >= min_duration:
-                zone_count = sum(
-                    detections_per_sec.get(zone_start + i, 0) for i in range(zone_duration)
-                )
                 zones.append(
-                    NoiseZone(float(zone_start), float(zone_start + zone_duration), zone_count)
+                    NoiseZone(
+                        float(zone_start),
+                        float(zone_start + zone_duration),
+                        zone_count(zone_start, zone_duration),
+                    )
                 )
             zone_start = t
             zone_end = t
@@ -532,8 +518,13 @@ def detect_noise_zones(
     # Don't forget last zone
     zone_duration = zone_end - zone_start + window_size
     if zone_duration >= min_duration:
-        zone_count = sum(detections_per_sec.get(zone_start + i, 0) for i in range(zone_duration))
-        zones.append(NoiseZone(float(zone_start), float(zone_start + zone_duration), zone_count))
+        zones.append(
+            NoiseZone(
+                float(zone_start),
+                float(zone_start + zone_duration),
+                zone_count(zone_start, zone_duration),
+            )
+        )
 
     # Merge zones within merge_gap
     if len(zones) > 1:
@@ -576,6 +567,14 @@ def suppress_noise_detections(
     return filtered
 
 
+def _window_max(values: dict[int, float], size: int, window: int) -> np.ndarray:
+    """Per-second max of values (floored at 0) within +-window, for seconds 0..size-1."""
+    dense = np.zeros(size + 2 * window)
+    if values:
+        dense[np.fromiter(values, int, len(values)) + window] = list(values.values())
+    return np.lib.stride_tricks.sliding_window_view(dense, 2 * window + 1).max(axis=1)
+
+
 @overload
 def find_cuts(
     scenes: list[tuple[float, float]],
@@ -647,6 +646,11 @@ def find_cuts(
         if t not in black_map or duration > black_map[t][1]:
             black_map[t] = (end_time, duration)
 
+    # Max black duration / audio step within +-window of each second
+    size = max([*scene_totals, *black_map, *audio_changes], default=-1) + 1
+    black_best = _window_max({t: d for t, (_, d) in black_map.items()}, size, window)
+    audio_best = _window_max(audio_changes, size, window)
+
     # Build candidates from scene clusters (not from window expansion)
     candidates: list[CutCandidate] = []
 
@@ -660,18 +664,9 @@ def find_cuts(
         if max_score < 8:
             continue
 
-        # Look for corroborating signals in nearby seconds
-        best_black_duration = 0.0
-        best_audio_step = 0.0
-
-        for offset in range(-window, window + 1):
-            check_t = t + offset
-            if check_t in black_map:
-                _, duration = black_map[check_t]
-                if duration > best_black_duration:
-                    best_black_duration = duration
-            if check_t in audio_changes and audio_changes[check_t] > best_audio_step:
-                best_audio_step = audio_changes[check_t]
+        # Strongest corroborating signals in nearby seconds
+        best_black_duration = float(black_best[t])
+        best_audio_step = float(audio_best[t])
 
         # Only apply audio bonus if scene is strong (max >= 10)
         # For borderline detections, audio often indicates noise not confirmation
@@ -699,18 +694,17 @@ def find_cuts(
     # Sort by confidence score (highest first) for greedy selection
     sorted_candidates = sorted(candidates, key=lambda c: -c.confidence_score)
     selected = []
+    kept_times: list[float] = []  # sorted times of selected, for nearest-neighbour checks
 
     for candidate in sorted_candidates:
         if candidate.confidence_score < min_confidence:
             continue
 
-        too_close = False
-        for existing in selected:
-            if abs(candidate.time - existing.time) < min_gap:
-                too_close = True
-                break
-
-        if not too_close:
+        # Only the nearest kept times on either side can be within min_gap
+        i = bisect.bisect_left(kept_times, candidate.time)
+        neighbours = kept_times[max(0, i - 1) : i + 1]
+        if all(abs(candidate.time - t) >= min_gap for t in neighbours):
+            bisect.insort(kept_times, candidate.time)
             selected.append(candidate)
 
     result = sorted(selected, key=lambda c: c.time)
@@ -727,6 +721,7 @@ def detect_cuts(
     min_gap: float = 1.0,
     verbose: bool = False,
     log_file=None,
+    duration: float | None = None,
 ) -> CutDetectionResult:
     """Run full cut detection pipeline: detect signals -> find cuts -> verify.
 
@@ -737,14 +732,14 @@ def detect_cuts(
         min_confidence: Minimum confidence score for cuts
         min_gap: Minimum gap between cuts in seconds
         verbose: Print verbose verification output
+        duration: Total video duration if already known (None = probe with ffprobe)
     """
-    duration = get_video_duration(video_path)
+    if duration is None:
+        duration = get_video_duration(video_path)
     if end_time is None or end_time == 0:
         end_time = duration
 
-    scenes = detect_scenes(video_path, start_time=start_time, end_time=end_time)
-    blacks = detect_black_frames(video_path, start_time=start_time, end_time=end_time)
-    audio_changes = detect_audio_changes(
+    scenes, blacks, audio_changes = detect_all_signals(
         video_path, duration, start_time=start_time, end_time=end_time
     )
 
@@ -33,6 +33,28 @@ class VideoMetadata(BaseModel):
         return cls.model_validate_json(path.read_text())
 
 
+class ProbeEntry(BaseModel):
+    """Cached ffprobe result for a file, valid while mtime and size match."""
+
+    mtime_ns: int
+    size: int
+    duration: float
+    fps: float | None = None  # None for audio-only files (or entries cached before fps)
+
+
+class ProbeCacheFile(BaseModel):
+    """On-disk ffprobe cache for the files in one directory, keyed by file name."""
+
+    entries: dict[str, ProbeEntry] = Field(default_factory=dict)
+
+    def save(self, path: Path) -> None:
+        path.write_text(self.model_dump_json())
+
+    @classmethod
+    def load(cls, path: Path) -> "ProbeCacheFile":
+        return cls.model_validate_json(path.read_text())
+
+
 ConfidenceLevel = Literal["high", "medium", "low"]
 
 
@@ -36,7 +36,7 @@ def preprocess_dv_file(input_path: Path, output_path: Path, threads: int = 0) ->
         "192k",
         str(temp_path),
     ]
-    run_ffmpeg(cmd, check=True)
+    run_ffmpeg(cmd, check=True, quiet=True)
     temp_path.rename(output_path)
 
 
@@ -67,5 +67,5 @@ def preprocess_film_scan(input_path: Path, output_path: Path, threads: int = 0)
         "copy",
         str(temp_path),
     ]
-    run_ffmpeg(cmd, check=True)
+    run_ffmpeg(cmd, check=True, quiet=True)
     temp_path.rename(output_path)
@@ -1,38 +1,27 @@
 """Video processing orchestration: process_clips and convert_to_mp4."""
 
-import multiprocessing
+import asyncio
 import os
+import threading
 from collections.abc import Callable
-from concurrent.futures import ThreadPoolExecutor, as_completed
 from pathlib import Path
 
 from .models import ClipInfo
-from .thumbnails import create_sprite, generate_thumbnails
-from .transcription import extract_audio, transcribe_from_wav, transcribe_worker
+from .thumbnails import generate_sprite
+from .transcription import get_batched_pipeline, transcribe_clips
 from .utils import (
     format_duration,
     get_default_workers,
     get_video_duration,
     has_content,
+    probe_cache,
     run_ffmpeg,
+    run_ffmpeg_async,
 )
 
 
-def convert_to_mp4(video_path: Path, threads: int = 0, log: Callable[[str], None] = print) -> Path:
-    """Convert video to MP4 if not already.
-
-    Args:
-        threads: Number of encoding threads (0 = auto/all cores)
-    """
-    if video_path.suffix.lower() == ".mp4":
-        return video_path
-
-    mp4_path = video_path.with_suffix(".mp4")
-    if mp4_path.exists():
-        return mp4_path
-
-    log("    Converting to MP4...")
-    cmd = [
+def _convert_cmd(video_path: Path, mp4_path: Path, threads: int) -> list[str]:
+    return [
         "ffmpeg",
         "-y",
         "-i",
@@ -53,10 +42,77 @@ def convert_to_mp4(video_path: Path, threads: int = 0, log: Callable[[str], None
         "128k",
         str(mp4_path),
     ]
-    run_ffmpeg(cmd, check=True)
+
+
+def convert_to_mp4(video_path: Path, threads: int = 0, log: Callable[[str], None] = print) -> Path:
+    """Convert video to MP4 if not already.
+
+    Args:
+        threads: Number of encoding threads (0 = auto/all cores)
+    """
+    if video_path.suffix.lower() == ".mp4":
+        return video_path
+
+    mp4_path = video_path.with_suffix(".mp4")
+    if mp4_path.exists():
+        return mp4_path
+
+    log("    Converting to MP4...")
+    run_ffmpeg(_convert_cmd(video_path, mp4_path, threads), check=True, quiet=True)
     return mp4_path
 
 
+async def convert_to_mp4_async(
+    video_path: Path, threads: int = 0, log: Callable[[str], None] = print
+) -> Path:
+    """Async convert_to_mp4 for the process_clips event loop."""
+    if video_path.suffix.lower() == ".mp4":
+        return video_path
+
+    mp4_path = video_path.with_suffix(".mp4")
+    if mp4_path.exists():
+        return mp4_path
+
+    log("    Converting to MP4...")
+    await run_ffmpeg_async(_convert_cmd(video_path, mp4_path, threads), check=True, quiet=True)
+    return mp4_path
+
+
+async def _prepare_clip(
+    video_path: Path,
+    thumb_dir: Path,
+    convert_threads: int,
+    sprite_threads: int,
+    sem: asyncio.Semaphore,
+    log: Callable[[str], None],
+) -> tuple[Path, float, str | None]:
+    """Convert, probe and sprite one clip. Returns (mp4_path, duration, sprite filename).
+
+    Failures are logged and degrade to the original file, 0.0 and no sprite.
+    """
+    async with sem:
+        mp4 = video_path
+        try:
+            mp4 = await convert_to_mp4_async(video_path, convert_threads, log)
+        except Exception as e:
+            log(f"    Error converting {video_path.name}: {e}")  # keep original on error
+
+        try:
+            # ffprobe is short-lived and cached; a worker thread keeps the cache in one place
+            duration = await asyncio.to_thread(get_video_duration, mp4)
+        except Exception as e:
+            log(f"    Error getting duration for {mp4.name}: {e}")
+            duration = 0.0
+
+        try:
+            sprite = await generate_sprite(mp4, thumb_dir, duration, threads=sprite_threads)
+        except Exception as e:
+            log(f"    Error generating sprite for {mp4.name}: {e}")
+            sprite = None
+
+    return mp4, duration, sprite
+
+
 def process_clips(
     video_subdir: Path,
     video_files: list[Path],
@@ -65,7 +121,7 @@ def process_clips(
     transcribe_workers: int = 1,
     log: Callable[[str], None] = print,
 ) -> list[ClipInfo]:
-    """Process clips with parallel audio extraction and thumbnails."""
+    """Process clips: per-clip conversion, probing and sprites in parallel, then transcription."""
     thumb_dir = video_subdir / "thumbs"
     thumb_dir.mkdir(exist_ok=True)
 
@@ -74,111 +130,54 @@ def process_clips(
 
     log(f"Processing {len(video_files)} clips (workers={workers})...")
 
-    # Phase 1: Convert to MP4 if needed (parallel)
-    non_mp4 = [(i, v) for i, v in enumerate(video_files) if v.suffix.lower() != ".mp4"]
-    mp4_results = {}  # index -> mp4_path
+    # Clips already transcribed, from one directory listing instead of a stat per clip
+    with os.scandir(video_subdir) as entries:
+        transcribed = {e.name for e in entries if e.name.endswith(".txt")}
+    needs_transcript = [f"{v.stem}.txt" not in transcribed for v in video_files]
+
+    # Load Whisper in the background so it overlaps conversion, probing and sprites
+    warm_model = None
+    if transcribe and transcribe_workers == 1 and any(needs_transcript):
+        warm_model = threading.Thread(target=get_batched_pipeline, daemon=True)
+        warm_model.start()
+
+    # Phase 1: Per clip, convert to MP4 if needed -> probe duration -> sprite, with up to
+    # `workers` clips in flight on one event loop. Each clip moves on as soon as its own
+    # conversion is done.
+    cpu_count = os.cpu_count() or 4
+    non_mp4 = [v for v in video_files if v.suffix.lower() != ".mp4"]
+    # Limit parallelism: fewer conversions than workers = more threads per conversion
+    convert_threads = max(1, cpu_count // min(workers, len(non_mp4))) if non_mp4 else 0
+    # Split cores between workers so parallel ffmpegs don't each spawn a thread per core
+    sprite_threads = max(1, cpu_count // workers)
     if non_mp4:
-        # Limit parallelism: fewer workers than files = more threads per worker
-        cpu_count = os.cpu_count() or 4
-        convert_workers = min(workers, len(non_mp4))
-        threads = max(1, cpu_count // convert_workers)
-        log(
-            f"  Converting {len(non_mp4)} non-MP4 files ({convert_workers} workers, {threads} threads each)..."
+        log(f"  Converting {len(non_mp4)} non-MP4 files ({convert_threads} threads each)...")
+    log("  Getting durations and generating sprites...")
+
+    async def prepare_all() -> list[tuple[Path, float, str | None]]:
+        sem = asyncio.Semaphore(workers)
+        return await asyncio.gather(
+            *(
+                _prepare_clip(v, thumb_dir, convert_threads, sprite_threads, sem, log)
+                for v in video_files
+            )
         )
-        with ThreadPoolExecutor(max_workers=convert_workers) as executor:
-            futures = {executor.submit(convert_to_mp4, v, threads, log): i for i, v in non_mp4}
-            for future in as_completed(futures):
-                idx = futures[future]
-                try:
-                    mp4_results[idx] = future.result()
-                except Exception as e:
-                    log(f"    Error converting {video_files[idx].name}: {e}")
-                    mp4_results[idx] = video_files[idx]  # keep original on error
-    # Build mp4_files list preserving order
-    mp4_files = [
-        mp4_results.get(i, v if v.suffix.lower() == ".mp4" else v.with_suffix(".mp4"))
-        for i, v in enumerate(video_files)
-    ]
 
-    # Phase 2: Get durations for all files (needed for thumbnails and final clip info)
-    log("  Getting durations...")
-    durations = {}
-    with ThreadPoolExecutor(max_workers=workers) as executor:
-        futures = {executor.submit(get_video_duration, f): f for f in mp4_files}
-        for future in as_completed(futures):
-            mp4 = futures[future]
-            try:
-                durations[mp4] = future.result()
-            except Exception as e:
-                log(f"    Error getting duration for {mp4.name}: {e}")
-                durations[mp4] = 0.0
-
-    # Phase 3: Extract audio in parallel (for files needing transcription)
-    wav_map = {}  # mp4_path -> wav_path
+    with probe_cache(video_subdir / ".probe_cache.json"):
+        prepared = asyncio.run(prepare_all())
+
+    mp4_files = [mp4 for mp4, _, _ in prepared]
+    durations = {mp4: duration for mp4, duration, _ in prepared}
+    sprite_results = {mp4: sprite for mp4, _, sprite in prepared}
+
+    # Phase 2: Transcribe, decoding audio straight into Whisper
+    transcripts = {}
+    if warm_model is not None:
+        warm_model.join()
     if transcribe:
-        to_transcribe = [f for f in mp4_files if not f.with_suffix(".txt").exists()]
+        to_transcribe = [f for f, needed in zip(mp4_files, needs_transcript, strict=True) if needed]
         if to_transcribe:
-            log(f"  Extracting audio for {len(to_transcribe)} files...")
-            with ThreadPoolExecutor(max_workers=workers) as executor:
-                futures = {executor.submit(extract_audio, f): f for f in to_transcribe}
-                for future in as_completed(futures):
-                    mp4 = futures[future]
-                    try:
-                        wav_map[mp4] = future.result()
-                    except Exception as e:
-                        log(f"    Error extracting audio for {mp4.name}: {e}")
-
-    # Phase 4: Transcribe (parallel with multiprocessing if transcribe_workers > 1)
-    transcripts = {}
-    if transcribe and wav_map:
-        log(f"  Transcribing {len(wav_map)} files ({transcribe_workers} workers)...")
-        try:
-            if transcribe_workers == 1:
-                # Sequential - no multiprocessing overhead
-                for i, (mp4, wav) in enumerate(wav_map.items(), 1):
-                    log(f"    [{i}/{len(wav_map)}] {mp4.name}")
-                    transcripts[mp4] = transcribe_from_wav(mp4, wav)
-            else:
-                # Parallel - each process loads own model
-                work_items = [(str(mp4), str(wav)) for mp4, wav in wav_map.items()]
-                ctx = multiprocessing.get_context("spawn")
-                pool = ctx.Pool(processes=transcribe_workers)
-                try:
-                    for i, (video_path_str, transcript) in enumerate(
-                        pool.imap_unordered(transcribe_worker, work_items), 1
-                    ):
-                        log(f"    [{i}/{len(wav_map)}] {Path(video_path_str).name}")
-                        transcripts[Path(video_path_str)] = transcript
-                finally:
-                    pool.close()
-                    pool.join()
-        except Exception:
-            # Clean up WAV files on error
-            for wav in wav_map.values():
-                wav.unlink(missing_ok=True)
-            raise
-
-    # Phase 5: Generate thumbnails and sprites in parallel
-    log("  Generating thumbnails...")
-    thumb_results = {}
-    with ThreadPoolExecutor(max_workers=workers) as executor:
-        futures = {
-            executor.submit(generate_thumbnails, f, thumb_dir, durations[f]): f for f in mp4_files
-        }
-        for future in as_completed(futures):
-            mp4 = futures[future]
-            try:
-                thumb_results[mp4] = future.result()
-            except Exception as e:
-                log(f"    Error generating thumbnails for {mp4.name}: {e}")
-                thumb_results[mp4] = []
-
-    # Create sprites from thumbnails (deletes individual thumbs)
-    log("  Creating sprites...")
-    sprite_results = {}
-    for mp4_file in mp4_files:
-        thumbs = thumb_results.get(mp4_file, [])
-        sprite_results[mp4_file] = create_sprite(thumb_dir, thumbs, mp4_file.stem)
+            transcripts = transcribe_clips(to_transcribe, workers, transcribe_workers, log)
 
     # Build final clip list (preserve original order)
     clips = []
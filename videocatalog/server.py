@@ -1,16 +1,37 @@
 """FastAPI server for editing video metadata."""
 
+import asyncio
+import mimetypes
+import os
+import stat
+import threading
+import time
+from email.utils import parsedate
+from functools import lru_cache
 from pathlib import Path
 
-from fastapi import FastAPI, HTTPException
-from fastapi.responses import FileResponse
-from fastapi.staticfiles import StaticFiles
+from fastapi import BackgroundTasks, FastAPI, HTTPException, Request
+from fastapi.responses import FileResponse, Response
+from starlette.datastructures import Headers
+from starlette.staticfiles import NotModifiedResponse
 
 from .gallery import generate_gallery
 from .models import UserEditsFile
 
 app = FastAPI(title="Video Catalog")
 
+# Seconds a directory scan in create_app stays fresh for repeated calls
+VIDEO_SCAN_TTL = 5.0
+
+# output_dir -> (monotonic time of its last scan, video subdir names found)
+_video_scans: dict[Path, tuple[float, set[str]]] = {}
+
+# Seconds after the last saved edit before the gallery is regenerated
+GALLERY_REGEN_DELAY = 0.5
+
+# Held while generate_gallery runs, so regenerations never overlap
+_regen_lock = threading.Lock()
+
 
 @app.get("/")
 async def index():
@@ -18,66 +39,179 @@ async def index():
     if not hasattr(app.state, "output_dir"):
         raise HTTPException(500, "Server not configured")
     if getattr(app.state, "regenerate", False):
-        generate_gallery(app.state.output_dir)
+        _regenerate_gallery()
+    elif (pending := getattr(app.state, "regen_task", None)) is not None and not pending.done():
+        # Let a scheduled regeneration finish so the page reflects recent edits
+        try:
+            await asyncio.shield(pending)
+        except asyncio.CancelledError:
+            if not pending.cancelled():
+                raise
     gallery_path = app.state.output_dir / "gallery.html"
-    if not gallery_path.exists():
-        raise HTTPException(404, "Gallery not found")
-    return FileResponse(gallery_path)
+
+    # One fresh stat serves both the existence check and FileResponse's headers. It is
+    # never reused across requests: the CLI may rewrite gallery.html at any time, and a
+    # stale size would truncate or overrun the response body.
+    try:
+        st = os.stat(gallery_path)
+    except FileNotFoundError:
+        raise HTTPException(404, "Gallery not found") from None
+    return FileResponse(gallery_path, stat_result=st)
+
+
+def _regenerate_gallery() -> None:
+    """Regenerate gallery.html (one regeneration at a time)."""
+    with _regen_lock:
+        generate_gallery(app.state.output_dir)
+
+
+async def _schedule_regenerate() -> None:
+    """Regenerate the gallery once edits settle; a newer save restarts the wait."""
+    pending = getattr(app.state, "regen_task", None)
+    if pending is not None and not pending.done():
+        pending.cancel()
+    app.state.regen_task = asyncio.create_task(_regenerate_after_delay())
+
+
+async def _regenerate_after_delay() -> None:
+    try:
+        await asyncio.sleep(GALLERY_REGEN_DELAY)
+        await asyncio.to_thread(_regenerate_gallery)
+    except Exception as e:
+        # Nobody awaits this task for its result; a failure must not break index
+        print(f"Error regenerating gallery: {e}")
+    finally:
+        if getattr(app.state, "regen_task", None) is asyncio.current_task():
+            app.state.regen_task = None
 
 
 def _get_video_dir(video_name: str) -> Path:
-    """Get video directory, validating it exists and is within output_dir."""
+    """Get video directory, validating it exists and is directly inside output_dir.
+
+    output_dir is resolved once in create_app. A name that is a single path component
+    can't escape it, so no per-request resolve() is needed: known names are trusted,
+    others cost one stat and are remembered.
+    """
     if not hasattr(app.state, "output_dir"):
         raise HTTPException(500, "Server not configured")
 
-    output_dir = app.state.output_dir.resolve()
-    video_dir = (output_dir / video_name).resolve()
-    if not video_dir.is_relative_to(output_dir):
+    if video_name in ("", ".", "..") or any(c in video_name for c in "/\\\0"):
         raise HTTPException(400, "Invalid video name")
-    if not video_dir.is_dir():
-        raise HTTPException(404, f"Video not found: {video_name}")
+    video_dir = app.state.output_dir / video_name
+    if video_name not in app.state.video_names:
+        try:
+            is_dir = stat.S_ISDIR(os.stat(video_dir).st_mode)
+        except (FileNotFoundError, NotADirectoryError):
+            is_dir = False
+        if not is_dir:
+            raise HTTPException(404, f"Video not found: {video_name}")
+        app.state.video_names.add(video_name)
     return video_dir
 
 
 @app.get("/api/edits/{video_name}")
-async def get_edits(video_name: str) -> dict:
+async def get_edits(video_name: str) -> Response:
     """Get user edits for a video."""
     video_dir = _get_video_dir(video_name)
 
+    # Validated and serialized by pydantic's JSON core directly, skipping FastAPI's
+    # dict encoding of the response
     edits_path = video_dir / "user_edits.json"
     if edits_path.exists():
-        return UserEditsFile.load(edits_path).model_dump()
-    return UserEditsFile().model_dump()
+        edits = await asyncio.to_thread(UserEditsFile.load, edits_path)
+    else:
+        edits = UserEditsFile()
+    return Response(edits.model_dump_json(), media_type="application/json")
 
 
 @app.put("/api/edits/{video_name}")
-async def save_edits(video_name: str, edits: UserEditsFile) -> dict:
-    """Save user edits for a video and regenerate gallery."""
+async def save_edits(video_name: str, edits: UserEditsFile, background: BackgroundTasks) -> dict:
+    """Save user edits for a video and schedule a gallery regeneration."""
     video_dir = _get_video_dir(video_name)
 
+    # Serialize and write off the event loop so other requests keep being served
     edits_path = video_dir / "user_edits.json"
-    edits.save(edits_path)
+    try:
+        await asyncio.to_thread(edits.save, edits_path)
+    except (FileNotFoundError, NotADirectoryError):
+        # Directory removed since it was cached as a known video name
+        app.state.video_names.discard(video_name)
+        raise HTTPException(404, f"Video not found: {video_name}") from None
 
-    generate_gallery(app.state.output_dir)
+    background.add_task(_schedule_regenerate)
 
     return {"status": "ok"}
 
 
+class VideoFileResponse(FileResponse):
+    """FileResponse reading 1 MiB per chunk: clips are large and mostly sent whole."""
+
+    chunk_size = 1024 * 1024
+
+
+@lru_cache(maxsize=64)
+def _media_type(suffix: str) -> str:
+    """Media type by file extension (a gallery only holds a handful of kinds)."""
+    return mimetypes.guess_type(f"file{suffix}")[0] or "text/plain"
+
+
+# Static files for video subdirs (must be after API routes). One parametrized route
+# replaces a StaticFiles mount per video, so routing stays constant-time.
+@app.api_route("/{video_name}/{file_path:path}", methods=["GET", "HEAD"])
+async def video_file(video_name: str, file_path: str, request: Request) -> Response:
+    """Serve a clip, sprite or other file from a video directory."""
+    video_dir = _get_video_dir(video_name)
+    found = await asyncio.to_thread(_find_file, video_dir, file_path)
+    if found is None:
+        raise HTTPException(404, "Not Found")
+    path, st = found
+    response = VideoFileResponse(path, stat_result=st, media_type=_media_type(path.suffix.lower()))
+    if _is_not_modified(response.headers, request.headers):
+        return NotModifiedResponse(response.headers)
+    return response
+
+
+def _find_file(video_dir: Path, file_path: str) -> tuple[Path, os.stat_result] | None:
+    """Resolve and stat a regular file inside video_dir (symlinks may not escape it)."""
+    path = (video_dir / file_path).resolve()
+    if not path.is_relative_to(video_dir.resolve()):
+        return None
+    try:
+        st = os.stat(path)
+    except (FileNotFoundError, NotADirectoryError):
+        return None
+    return (path, st) if stat.S_ISREG(st.st_mode) else None
+
+
+def _is_not_modified(response_headers: Headers, request_headers: Headers) -> bool:
+    """Whether a 304 can be sent instead (same rules as Starlette's StaticFiles)."""
+    if if_none_match := request_headers.get("if-none-match"):
+        return response_headers["etag"] in [tag.strip(" W/") for tag in if_none_match.split(",")]
+    if_modified_since = parsedate(request_headers.get("if-modified-since", ""))
+    last_modified = parsedate(response_headers.get("last-modified", ""))
+    return (
+        if_modified_since is not None
+        and last_modified is not None
+        and if_modified_since >= last_modified
+    )
+
+
 def create_app(directory: Path, regenerate: bool = False) -> FastAPI:
-    """Create app with static files mounted."""
+    """Configure the app for an output directory."""
     app.state.output_dir = directory.resolve()
     app.state.regenerate = regenerate
 
-    # Track mounted routes to avoid duplicates on repeated calls
-    mounted = getattr(app.state, "mounted_routes", set())
-
-    # Mount static files for video subdirs (must be after API routes)
-    for subdir in app.state.output_dir.iterdir():
-        if subdir.is_dir() and subdir.name not in mounted:
-            app.mount(f"/{subdir.name}", StaticFiles(directory=subdir), name=subdir.name)
-            mounted.add(subdir.name)
-
-    app.state.mounted_routes = mounted
+    # Video subdirs served by video_file. A recent scan of the same directory is reused;
+    # each directory keeps its own set, so switching directories never mixes names.
+    scan = _video_scans.get(app.state.output_dir)
+    if scan is None or time.monotonic() - scan[0] >= VIDEO_SCAN_TTL:
+        # DirEntry.is_dir uses the type from the directory listing (stat only for symlinks)
+        with os.scandir(app.state.output_dir) as entries:
+            names = {entry.name for entry in entries if entry.is_dir()}
+        scan = (time.monotonic(), names)
+        _video_scans[app.state.output_dir] = scan
+
+    app.state.video_names = scan[1]
     return app
 
 
@@ -92,4 +226,6 @@ def run_server(
     print(f"Serving gallery at http://{host}:{port}")
     if regenerate:
         print("Gallery will regenerate on each page load")
-    uvicorn.run(app, host=host, port=port)
+    # The loop/http "auto" defaults already pick uvloop and httptools when installed.
+    # Per-request access logging is skipped: a gallery page pulls in many sprites.
+    uvicorn.run(app, host=host, port=port, access_log=False)
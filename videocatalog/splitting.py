@@ -1,10 +1,207 @@
 """Video splitting at detected cut boundaries."""
 
+import bisect
+import os
+import re
+import subprocess
 from collections.abc import Callable
+from functools import lru_cache
 from pathlib import Path
 
 from .models import CutCandidate
-from .utils import format_time, format_time_filename, run_ffmpeg
+from .utils import (
+    SubprocessError,
+    format_time,
+    format_time_filename,
+    get_keyframe_times,
+    run_ffmpeg,
+)
+
+# Max distance (seconds) a boundary may move to land on a keyframe for stream copy
+KEYFRAME_SNAP_TOLERANCE = 0.3
+
+# H.264 encoder for segments; empty picks the first working one in ENCODER_ARGS
+VIDEO_ENCODER = os.environ.get("VIDEOCATALOG_VIDEO_ENCODER", "")
+
+# Hardware encoders in order of preference, then libx264, with comparable quality settings.
+# Frames forced at cut times must come out as IDR keyframes for the segment muxer to split
+# there: NVENC and QSV need their forced-IDR option; VideoToolbox already encodes a forced
+# frame as a keyframe (kVTEncodeFrameOptionKey_ForceKeyFrame).
+ENCODER_ARGS = {
+    "h264_nvenc": ["-preset", "p4", "-rc", "vbr", "-cq", "23", "-b:v", "0", "-forced-idr", "1"],
+    "h264_qsv": ["-preset", "fast", "-global_quality", "23", "-forced_idr", "1"],
+    "h264_videotoolbox": ["-q:v", "55"],
+    "libx264": ["-preset", "fast", "-crf", "22"],
+}
+
+
+# Max seconds a single-pass segment may start away from its cut (frame rounding)
+SEGMENT_START_TOLERANCE = 0.1
+
+# Frames sampled from the start of a source by the interlace check
+IDET_FRAMES = 300
+
+_IDET_RE = re.compile(r"Multi frame detection: TFF:\s*(\d+)\s*BFF:\s*(\d+)\s*Progressive:\s*(\d+)")
+
+
+@lru_cache(maxsize=64)
+def _needs_transcode(video_path: Path) -> bool:
+    """Whether the source looks interlaced (per ffmpeg's idet) and so can't be copied."""
+    cmd = ["ffmpeg", "-hide_banner", "-nostats", "-i", str(video_path), "-vf", "idet"]
+    cmd += ["-frames:v", str(IDET_FRAMES), "-an", "-f", "null", "-"]
+    result = run_ffmpeg(cmd)
+    if result.returncode != 0:
+        return True
+    interlaced = progressive = 0
+    for tff, bff, prog in _IDET_RE.findall(result.stderr):
+        interlaced += int(tff) + int(bff)
+        progressive += int(prog)
+    return interlaced > progressive
+
+
+def snap_to_keyframe(keyframes: list[float], time: float, tolerance: float) -> float | None:
+    """Return the keyframe nearest to time if within tolerance, else None."""
+    i = bisect.bisect_left(keyframes, time)
+    nearby = keyframes[max(0, i - 1) : i + 1]
+    if not nearby:
+        return None
+    nearest = min(nearby, key=lambda k: abs(k - time))
+    return nearest if abs(nearest - time) <= tolerance else None
+
+
+@lru_cache(maxsize=1)
+def video_encoder() -> str:
+    """The H.264 encoder to use: VIDEOCATALOG_VIDEO_ENCODER, else the first that works.
+
+    ffmpeg builds list hardware encoders whether or not the hardware is present,
+    so each listed candidate gets a tiny test encode.
+    """
+    if VIDEO_ENCODER:
+        return VIDEO_ENCODER
+    listed = run_ffmpeg(["ffmpeg", "-hide_banner", "-encoders"]).stdout
+    for encoder in ENCODER_ARGS:
+        if encoder == "libx264" or f" {encoder} " not in listed:
+            continue
+        probe = ["ffmpeg", "-f", "lavfi", "-i", "color=s=256x256:d=0.1", "-c:v", encoder]
+        try:
+            if run_ffmpeg([*probe, "-f", "null", "-"], quiet=True).returncode == 0:
+                return encoder
+        except (OSError, subprocess.SubprocessError):
+            continue
+    return "libx264"
+
+
+def _encoder_args() -> list[str]:
+    encoder = video_encoder()
+    return ["-c:v", encoder, *ENCODER_ARGS.get(encoder, [])]
+
+
+def _copy_cmd(video_path: Path, start: float, length: float, output_path: Path) -> list[str]:
+    return [
+        "ffmpeg",
+        "-y",
+        "-ss",
+        str(start),
+        "-i",
+        str(video_path),
+        "-t",
+        str(length),
+        "-c",
+        "copy",
+        "-avoid_negative_ts",
+        "make_zero",
+        str(output_path),
+    ]
+
+
+def _transcode_cmd(video_path: Path, start: float, length: float, output_path: Path) -> list[str]:
+    return [
+        "ffmpeg",
+        "-y",
+        "-ss",
+        str(start),
+        "-i",
+        str(video_path),
+        "-t",
+        str(length),
+        "-vf",
+        "yadif,hqdn3d",
+        *_encoder_args(),
+        "-c:a",
+        "aac",
+        "-b:a",
+        "128k",
+        str(output_path),
+    ]
+
+
+def _segment_transcode_cmd(
+    video_path: Path, cut_times: list[float], length: float, pattern: Path, segment_list: Path
+) -> list[str]:
+    """Transcode the first length seconds once, starting a new numbered file at each cut.
+
+    Keyframes are forced at the cut times so the segment muxer splits exactly there. The
+    start time of each part actually written is listed in segment_list (CSV).
+    """
+    times = ",".join(str(t) for t in cut_times)
+    cmd = ["ffmpeg", "-y", "-i", str(video_path), "-t", str(length), "-vf", "yadif,hqdn3d"]
+    cmd += [*_encoder_args(), "-force_key_frames", times]
+    cmd += ["-c:a", "aac", "-b:a", "128k", "-f", "segment", "-segment_format", "mp4"]
+    cmd += ["-segment_times", times, "-reset_timestamps", "1"]
+    cmd += ["-segment_list", str(segment_list), "-segment_list_type", "csv", str(pattern)]
+    return cmd
+
+
+def _transcode_segments(
+    video_path: Path, output_dir: Path, boundaries: list[float], output_files: list[Path]
+) -> bool:
+    """Transcode all segments in one ffmpeg run. Returns False if that didn't work out."""
+    pattern = output_dir / f"{video_path.stem}_segment%03d.mp4"
+    segment_list = output_dir / f"{video_path.stem}_segments.csv"
+    cmd = _segment_transcode_cmd(
+        video_path, boundaries[1:-1], boundaries[-1], pattern, segment_list
+    )
+    result = run_ffmpeg(cmd, quiet=True)
+
+    # Numbered parts ffmpeg wrote, in order; a cut past the end of the input gives fewer
+    parts = []
+    while (part := output_dir / f"{video_path.stem}_segment{len(parts):03d}.mp4").exists():
+        parts.append(part)
+    times = _segment_times(segment_list)
+    segment_list.unlink(missing_ok=True)
+
+    # An encoder that ignores forced keyframes makes the muxer split at a later natural
+    # keyframe instead; catch that rather than silently shipping shifted clips. Listed
+    # times carry the encoder's constant B-frame delay, which the last end reveals.
+    ok = result.returncode == 0 and len(parts) == len(output_files) == len(times)
+    if ok:
+        delay = times[-1][1] - boundaries[-1]
+        ok = all(
+            abs(start - delay - cut) <= SEGMENT_START_TOLERANCE
+            for (start, _), cut in zip(times[1:], boundaries[1:-1], strict=True)
+        )
+    if not ok:
+        for part in parts:
+            part.unlink()
+        return False
+    for part, output_path in zip(parts, output_files, strict=True):
+        part.replace(output_path)
+    return True
+
+
+def _segment_times(segment_list: Path) -> list[tuple[float, float]]:
+    """(start, end) per part from the segment muxer's CSV list (filename,start,end)."""
+    try:
+        lines = segment_list.read_text().splitlines()
+    except FileNotFoundError:
+        return []
+    try:
+        return [
+            (float(start), float(end))
+            for _, start, end in (line.rsplit(",", 2) for line in lines if line)
+        ]
+    except ValueError:
+        return []
 
 
 def split_video(
@@ -13,51 +210,65 @@ def split_video(
     cuts: list[CutCandidate],
     duration: float,
     log: Callable[[str], None] = print,
+    no_reencode: bool = False,
+    max_snap: float = KEYFRAME_SNAP_TOLERANCE,
 ) -> list[Path]:
-    """Split video at cut boundaries, transcoding to MP4."""
+    """Split video at cut boundaries, transcoding to MP4.
+
+    Without no_reencode, all segments come from a single ffmpeg run (one decode, one
+    encoder) via the segment muxer, falling back to one run per segment on failure.
+    With no_reencode, boundaries within max_snap seconds of a keyframe are snapped
+    to it and those segments are stream-copied (no deinterlace/denoise). Segments
+    that can't be copied fall back to transcoding, as does the whole video when it
+    turns out to be interlaced.
+    """
     output_dir.mkdir(parents=True, exist_ok=True)
 
     stem = video_path.stem
     boundaries = [0.0] + [c.time for c in cuts] + [duration]
-    output_files = []
 
-    for i in range(len(boundaries) - 1):
-        start = boundaries[i]
-        end = boundaries[i + 1]
-        segment_num = i + 1
-        time_stamp = format_time_filename(start)
+    # Snapped boundary (or None when not near a keyframe) for each original boundary
+    snapped: list[float | None] = [None] * len(boundaries)
+    if no_reencode and _needs_transcode(video_path):
+        log("  Source looks interlaced; transcoding instead of stream copy")
+        no_reencode = False
+    if no_reencode:
+        keyframes = get_keyframe_times(video_path)
+        snapped = [snap_to_keyframe(keyframes, t, max_snap) for t in boundaries]
+        snapped[-1] = duration  # end of input needs no keyframe
 
-        output_path = output_dir / f"{stem}_{time_stamp}.mp4"
-        output_files.append(output_path)
+    output_files = [output_dir / f"{stem}_{format_time_filename(t)}.mp4" for t in boundaries[:-1]]
+    segments = []
 
+    for i, output_path in enumerate(output_files):
+        snap_start, snap_end = snapped[i], snapped[i + 1]
+        start = boundaries[i] if snap_start is None else snap_start
+        end = boundaries[i + 1] if snap_end is None else snap_end
+        copy = snap_start is not None
+        segments.append((start, end, copy))
         log(
-            f"  Segment {segment_num}: {format_time(start)} -> {format_time(end)} => {output_path.name}"
+            f"  Segment {i + 1}: {format_time(start)} -> {format_time(end)} => {output_path.name}"
+            + (" (copy)" if copy else "")
         )
 
-        cmd = [
-            "ffmpeg",
-            "-y",
-            "-ss",
-            str(start),
-            "-i",
-            str(video_path),
-            "-t",
-            str(end - start),
-            "-vf",
-            "yadif,hqdn3d",
-            "-c:v",
-            "libx264",
-            "-preset",
-            "fast",
-            "-crf",
-            "22",
-            "-c:a",
-            "aac",
-            "-b:a",
-            "128k",
-            str(output_path),
-        ]
+    # A single segment is one ffmpeg run either way
+    if not no_reencode and cuts:
+        if _transcode_segments(video_path, output_dir, boundaries, output_files):
+            return output_files
+        log("    Single-pass transcode failed, transcoding segments one by one")
 
-        run_ffmpeg(cmd, check=True)
+    for (start, end, copy), output_path in zip(segments, output_files, strict=True):
+        if copy:
+            try:
+                run_ffmpeg(
+                    _copy_cmd(video_path, start, end - start, output_path), check=True, quiet=True
+                )
+                continue
+            except SubprocessError as e:
+                log(f"    Stream copy failed, transcoding instead: {e}")
+
+        run_ffmpeg(
+            _transcode_cmd(video_path, start, end - start, output_path), check=True, quiet=True
+        )
 
     return output_files
@@ -1,19 +1,27 @@
-"""Thumbnail and sprite generation for video clips."""
+"""Sprite generation for video clips."""
 
-import subprocess
 from pathlib import Path
 
-from PIL import Image, ImageOps
+from .utils import run_ffmpeg_async
 
 SPRITE_THUMB_W, SPRITE_THUMB_H = 320, 180
 SPRITE_GAP = 2
+SPRITE_COLS, SPRITE_ROWS = 4, 3
 
 
-def generate_thumbnails(
-    video_path: Path, thumb_dir: Path, duration: float, count: int = 12
-) -> list[str]:
-    """Generate multiple thumbnails from video, always including first and last frame."""
-    thumbs = []
+async def generate_sprite(
+    video_path: Path, thumb_dir: Path, duration: float, count: int = 12, threads: int = 0
+) -> str | None:
+    """Generate a thumbnail sprite, always including first and last frame. Returns sprite filename.
+
+    A single ffmpeg run seeks to each thumbnail time (one input per seek), scales and
+    crops each frame to the tile size and tiles them straight into the WebP sprite.
+
+    Args:
+        threads: Decoder threads per input (0 = auto/all cores)
+    """
+    if count <= 0:
+        return None
 
     # Generate seek times: first frame, evenly spaced middle frames, last frame
     seek_times = [0.0]  # First frame
@@ -23,52 +31,41 @@ def generate_thumbnails(
     if count > 1:
         seek_times.append(max(0, duration - 0.1))  # Last frame
 
-    for i, seek in enumerate(seek_times):
-        thumb_name = f"{video_path.stem}_{i}.jpg"
-        thumb_path = thumb_dir / thumb_name
-
-        cmd = [
-            "ffmpeg",
-            "-y",
-            "-ss",
-            str(seek),
-            "-i",
-            str(video_path),
-            "-vframes",
-            "1",
-            "-q:v",
-            "3",
-            str(thumb_path),
-        ]
-        subprocess.run(cmd, capture_output=True)
-        thumbs.append(thumb_name)
-
-    return thumbs
-
-
-def create_sprite(thumb_dir: Path, thumb_names: list[str], video_stem: str) -> str | None:
-    """Create sprite from thumbnails and delete originals. Returns sprite filename."""
-    if not thumb_names:
-        return None
-
-    cols, rows = 4, 3
-    sprite_w = SPRITE_THUMB_W * cols + SPRITE_GAP * (cols - 1)
-    sprite_h = SPRITE_THUMB_H * rows + SPRITE_GAP * (rows - 1)
-    sprite = Image.new("RGBA", (sprite_w, sprite_h), (0, 0, 0, 0))
+    cmd = ["ffmpeg", "-y", "-filter_complex_threads", str(threads)]
+    for seek in seek_times:
+        cmd += ["-threads", str(threads), "-ss", str(seek), "-i", str(video_path)]
 
-    for i, thumb_name in enumerate(thumb_names):
-        thumb_path = thumb_dir / thumb_name
-        if not thumb_path.exists():
-            continue
-        col, row = i % cols, i // cols
-        x = col * (SPRITE_THUMB_W + SPRITE_GAP)
-        y = row * (SPRITE_THUMB_H + SPRITE_GAP)
-        img = ImageOps.fit(
-            Image.open(thumb_path), (SPRITE_THUMB_W, SPRITE_THUMB_H), Image.Resampling.LANCZOS
-        )
-        sprite.paste(img, (x, y))
-        thumb_path.unlink()
+    # One frame per input, fitted to the tile (bilinear is plenty at thumbnail size),
+    # then concatenated and tiled
+    filters = [
+        f"[{i}:v:0]trim=end_frame=1,"
+        f"scale={SPRITE_THUMB_W}:{SPRITE_THUMB_H}:force_original_aspect_ratio=increase:flags=bilinear,"
+        f"crop={SPRITE_THUMB_W}:{SPRITE_THUMB_H},setsar=1,format=yuv420p[t{i}]"
+        for i in range(len(seek_times))
+    ]
+    tiles = "".join(f"[t{i}]" for i in range(len(seek_times)))
+    filters.append(
+        f"{tiles}concat=n={len(seek_times)}:v=1:a=0,"
+        f"tile={SPRITE_COLS}x{SPRITE_ROWS}:padding={SPRITE_GAP}:color=black[sprite]"
+    )
 
-    sprite_name = f"{video_stem}_sprite.webp"
-    sprite.save(thumb_dir / sprite_name, "WEBP", quality=85)
+    sprite_name = f"{video_path.stem}_sprite.webp"
+    cmd += [
+        "-filter_complex",
+        ";".join(filters),
+        "-map",
+        "[sprite]",
+        "-frames:v",
+        "1",
+        "-c:v",
+        "libwebp",
+        # Level 2 halves encode time vs the default 4 at 320x180 tiles; q80 keeps the
+        # file slightly smaller than the old q85/level 4
+        "-quality",
+        "80",
+        "-compression_level",
+        "2",
+        str(thumb_dir / sprite_name),
+    ]
+    await run_ffmpeg_async(cmd, check=True, quiet=True)
     return sprite_name
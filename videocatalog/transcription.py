@@ -1,12 +1,51 @@
 """Whisper transcription for video clips."""
 
+import atexit
+import multiprocessing
 import os
 import subprocess
+from collections import deque
+from collections.abc import Callable
+from concurrent.futures import ThreadPoolExecutor
+from itertools import islice
+from multiprocessing.pool import Pool
 from pathlib import Path
 
-from .utils import has_content
+import numpy as np
+
+from .utils import SubprocessError, has_content
+
+# Whisper expects 16 kHz mono float32 samples
+SAMPLE_RATE = 16000
+
+# Model and CTranslate2 compute type, overridable via environment. large-v3 stays the
+# default: the distil-* checkpoints are English-only and the audio here is Norwegian.
+WHISPER_MODEL = os.environ.get("VIDEOCATALOG_WHISPER_MODEL", "large-v3")
+WHISPER_COMPUTE_TYPE = os.environ.get("VIDEOCATALOG_WHISPER_COMPUTE_TYPE", "")
+
+# 30 s windows decoded together by the batched pipeline (single-process path)
+WHISPER_BATCH_SIZE = 16
+
+# Clips whose audio is decoded ahead of the one being transcribed. Each is held as a
+# float32 array (~115 MB per 30 min), so this stays small regardless of core count.
+AUDIO_PREFETCH = 2
 
 _whisper_model = None
+_batched_pipeline = None
+
+# CPU threads for the model (0 = CTranslate2 default); set per pool worker
+_cpu_threads = 0
+
+# Spawned transcription workers, kept alive (with their models) between calls
+_transcribe_pool: Pool | None = None
+_transcribe_pool_size = 0
+
+
+def _default_compute_type() -> str:
+    """int8 weights with float16 activations on GPU, plain int8 on CPU."""
+    from ctranslate2 import get_cuda_device_count
+
+    return "int8_float16" if get_cuda_device_count() > 0 else "int8"
 
 
 def get_whisper_model():
@@ -15,69 +54,210 @@ def get_whisper_model():
     if _whisper_model is None:
         from faster_whisper import WhisperModel
 
-        print(f"  [pid {os.getpid()}] Loading Whisper large-v3 model...")
-        _whisper_model = WhisperModel("large-v3", device="auto", compute_type="auto")
+        compute_type = WHISPER_COMPUTE_TYPE or _default_compute_type()
+        print(f"  [pid {os.getpid()}] Loading Whisper {WHISPER_MODEL} model ({compute_type})...")
+        _whisper_model = WhisperModel(
+            WHISPER_MODEL, device="auto", compute_type=compute_type, cpu_threads=_cpu_threads
+        )
     return _whisper_model
 
 
-def extract_audio(video_path: Path) -> Path:
-    """Extract audio from video to WAV for cleaner transcription."""
-    wav_path = video_path.with_suffix(".wav")
-    if wav_path.exists():
-        return wav_path
+def get_batched_pipeline():
+    """Get or create a BatchedInferencePipeline around the Whisper model."""
+    global _batched_pipeline
+    if _batched_pipeline is None:
+        from faster_whisper import BatchedInferencePipeline
+
+        _batched_pipeline = BatchedInferencePipeline(model=get_whisper_model())
+    return _batched_pipeline
+
 
+def decode_audio(video_path: Path) -> np.ndarray:
+    """Decode the audio track to 16 kHz mono float32 samples via an ffmpeg pipe."""
     cmd = [
         "ffmpeg",
-        "-y",
+        "-hide_banner",
+        "-loglevel",
+        "error",
+        "-nostats",
         "-i",
         str(video_path),
         "-vn",
+        "-f",
+        "s16le",
         "-acodec",
         "pcm_s16le",
         "-ar",
-        "16000",
+        str(SAMPLE_RATE),
         "-ac",
         "1",
-        str(wav_path),
+        "pipe:1",
     ]
-    subprocess.run(cmd, capture_output=True)
-    return wav_path
+    result = subprocess.run(
+        cmd, stdin=subprocess.DEVNULL, stdout=subprocess.PIPE, stderr=subprocess.DEVNULL
+    )
+    if result.returncode != 0:
+        raise SubprocessError(f"Audio decode failed: {video_path.name}")
+    # Convert once, then scale in place rather than allocating a second float array
+    audio = np.frombuffer(result.stdout, np.int16).astype(np.float32)
+    audio *= 1 / 32768.0
+    return audio
+
 
+def _transcribe_audio(audio: np.ndarray, batch_size: int = 0) -> str:
+    """Run Whisper transcription on decoded audio samples.
 
-def _transcribe_wav(wav_path: Path) -> str:
-    """Run Whisper transcription on a WAV file."""
-    model = get_whisper_model()
+    With batch_size > 0, the clip's VAD-split 30 s windows are decoded in batches
+    through the batched pipeline instead of one after another.
+    """
+    options = {}
+    if batch_size > 0:
+        model = get_batched_pipeline()
+        options["batch_size"] = batch_size
+    else:
+        model = get_whisper_model()
     segments, _ = model.transcribe(
-        str(wav_path),
+        audio,
         language="no",
-        beam_size=10,
+        beam_size=5,
+        condition_on_previous_text=False,
+        no_speech_threshold=0.5,
         vad_filter=True,
         vad_parameters={"min_silence_duration_ms": 500},
+        **options,
     )
     return " ".join(seg.text.strip() for seg in segments)
 
 
-def transcribe_from_wav(video_path: Path, wav_path: Path) -> str:
-    """Transcribe from pre-extracted WAV file. Deletes WAV when done."""
+def transcribe_clip(video_path: Path, audio: np.ndarray | None = None, batch_size: int = 0) -> str:
+    """Transcribe a clip, reusing its .txt if present. Decodes audio unless given."""
     txt_path = video_path.with_suffix(".txt")
 
     if has_content(txt_path):
-        wav_path.unlink(missing_ok=True)
         return txt_path.read_text()
 
     try:
-        text = _transcribe_wav(wav_path)
+        if audio is None:
+            audio = decode_audio(video_path)
+        text = _transcribe_audio(audio, batch_size)
         txt_path.write_text(text)
         return text
     except Exception as e:
         print(f"    Error transcribing {video_path.name}: {e}")
         return ""
-    finally:
-        wav_path.unlink(missing_ok=True)
 
 
-def transcribe_worker(args: tuple[str, str]) -> tuple[str, str]:
+def transcribe_worker(video_path_str: str) -> tuple[str, str]:
     """Worker function for multiprocessing pool. Takes/returns strings for pickling."""
-    video_path_str, wav_path_str = args
-    transcript = transcribe_from_wav(Path(video_path_str), Path(wav_path_str))
+    transcript = transcribe_clip(Path(video_path_str))
     return (video_path_str, transcript)
+
+
+def _init_transcribe_worker(counter, devices: list[str], cpu_threads: int) -> None:
+    """Pool initializer: pick this worker's GPU (if several) and load the model up front."""
+    global _cpu_threads
+    with counter.get_lock():
+        index = counter.value
+        counter.value += 1
+    if len(devices) > 1:
+        # Must happen before CTranslate2 initializes CUDA in this process
+        os.environ["CUDA_VISIBLE_DEVICES"] = devices[index % len(devices)]
+    _cpu_threads = cpu_threads
+    # A failing initializer makes Pool respawn workers endlessly; leave errors to the clips
+    try:
+        get_whisper_model()
+    except Exception as e:
+        print(f"  [pid {os.getpid()}] Could not preload Whisper model: {e}")
+
+
+def _get_transcribe_pool(processes: int) -> Pool:
+    """Get the persistent spawn pool, recreating it if the worker count changed.
+
+    Workers are spread round-robin over the visible GPUs, so each model gets its own
+    device where possible. On CPU the cores are split between the workers.
+    """
+    global _transcribe_pool, _transcribe_pool_size
+    if _transcribe_pool is None or _transcribe_pool_size != processes:
+        _close_transcribe_pool()
+        from ctranslate2 import get_cuda_device_count
+
+        gpu_count = get_cuda_device_count()
+        visible = os.environ.get("CUDA_VISIBLE_DEVICES")
+        devices = visible.split(",")[:gpu_count] if visible else [str(i) for i in range(gpu_count)]
+        cpu_threads = 0 if gpu_count else max(1, (os.cpu_count() or 4) // processes)
+
+        ctx = multiprocessing.get_context("spawn")
+        _transcribe_pool = ctx.Pool(
+            processes=processes,
+            initializer=_init_transcribe_worker,
+            initargs=(ctx.Value("i", 0), devices, cpu_threads),
+        )
+        _transcribe_pool_size = processes
+    return _transcribe_pool
+
+
+def _close_transcribe_pool(terminate: bool = False) -> None:
+    global _transcribe_pool
+    if _transcribe_pool is not None:
+        if terminate:
+            _transcribe_pool.terminate()
+        else:
+            _transcribe_pool.close()
+        _transcribe_pool.join()
+        _transcribe_pool = None
+
+
+atexit.register(_close_transcribe_pool)
+
+
+def transcribe_clips(
+    video_files: list[Path],
+    workers: int,
+    transcribe_workers: int = 1,
+    log: Callable[[str], None] = print,
+) -> dict[Path, str]:
+    """Transcribe clips, returning transcripts keyed by path.
+
+    With one transcribe worker, audio for the next clips (at most AUDIO_PREFETCH,
+    and no more than `workers`) is decoded while the batched Whisper pipeline runs
+    on the current one. With more, each spawned process loads its own model and decodes its own
+    audio (useful with several GPUs); the pool stays up for later calls so the
+    models are loaded only once.
+    """
+    transcripts = {}
+    total = len(video_files)
+    log(f"  Transcribing {total} files ({transcribe_workers} workers)...")
+
+    if transcribe_workers == 1:
+        # Sequential - no multiprocessing overhead
+        prefetch = max(1, min(workers, AUDIO_PREFETCH))
+        with ThreadPoolExecutor(max_workers=prefetch) as executor:
+            queued = iter(video_files)
+            pending = deque(executor.submit(decode_audio, f) for f in islice(queued, prefetch))
+            for i, video_path in enumerate(video_files, 1):
+                future = pending.popleft()
+                if (upcoming := next(queued, None)) is not None:
+                    pending.append(executor.submit(decode_audio, upcoming))
+                log(f"    [{i}/{total}] {video_path.name}")
+                try:
+                    audio = future.result()
+                except Exception as e:
+                    log(f"    Error extracting audio for {video_path.name}: {e}")
+                    continue
+                transcripts[video_path] = transcribe_clip(video_path, audio, WHISPER_BATCH_SIZE)
+    else:
+        # Parallel - each process loads own model
+        work_items = [str(f) for f in video_files]
+        pool = _get_transcribe_pool(transcribe_workers)
+        chunksize = max(1, total // (4 * transcribe_workers))
+        try:
+            for i, (video_path_str, transcript) in enumerate(
+                pool.imap_unordered(transcribe_worker, work_items, chunksize=chunksize), 1
+            ):
+                log(f"    [{i}/{total}] {Path(video_path_str).name}")
+                transcripts[Path(video_path_str)] = transcript
+        except BaseException:
+            _close_transcribe_pool(terminate=True)
+            raise
+
+    return transcripts
@@ -1,10 +1,17 @@
 """Shared utilities for video processing."""
 
+import asyncio
+import json
 import os
 import re
 import subprocess
+from collections.abc import Iterator
+from contextlib import contextmanager
+from functools import lru_cache
 from pathlib import Path
 
+from .models import ProbeCacheFile, ProbeEntry
+
 
 class SubprocessError(Exception):
     """Raised when a subprocess command fails."""
@@ -12,14 +19,53 @@ class SubprocessError(Exception):
     pass
 
 
-def run_ffmpeg(cmd: list[str], check: bool = False) -> subprocess.CompletedProcess:
-    """Run an ffmpeg/ffprobe command, optionally checking for errors."""
-    result = subprocess.run(cmd, capture_output=True, text=True)
-    if check and result.returncode != 0:
-        raise SubprocessError(f"Command failed: {' '.join(cmd[:3])}...\n{result.stderr[:500]}")
+def run_ffmpeg(
+    cmd: list[str], check: bool = False, quiet: bool = False
+) -> subprocess.CompletedProcess:
+    """Run an ffmpeg/ffprobe command, optionally checking for errors.
+
+    With quiet, ffmpeg only logs errors: no banner or progress lines to buffer, and
+    failure messages start with the actual error.
+    """
+    if quiet:
+        cmd = _quiet_cmd(cmd)
+    result = subprocess.run(cmd, stdin=subprocess.DEVNULL, capture_output=True, text=True)
+    if check:
+        _check_result(cmd, result)
     return result
 
 
+async def run_ffmpeg_async(
+    cmd: list[str], check: bool = False, quiet: bool = False
+) -> subprocess.CompletedProcess:
+    """Async run_ffmpeg: lets one event loop drive many ffmpeg processes without a thread each."""
+    if quiet:
+        cmd = _quiet_cmd(cmd)
+    proc = await asyncio.create_subprocess_exec(
+        *cmd,
+        stdin=asyncio.subprocess.DEVNULL,
+        stdout=asyncio.subprocess.PIPE,
+        stderr=asyncio.subprocess.PIPE,
+    )
+    stdout, stderr = await proc.communicate()
+    returncode = await proc.wait()
+    result = subprocess.CompletedProcess(
+        cmd, returncode, stdout.decode(errors="replace"), stderr.decode(errors="replace")
+    )
+    if check:
+        _check_result(cmd, result)
+    return result
+
+
+def _quiet_cmd(cmd: list[str]) -> list[str]:
+    return [cmd[0], "-hide_banner", "-loglevel", "error", "-nostats", *cmd[1:]]
+
+
+def _check_result(cmd: list[str], result: subprocess.CompletedProcess) -> None:
+    if result.returncode != 0:
+        raise SubprocessError(f"Command failed: {' '.join(cmd[:3])}...\n{result.stderr[:500]}")
+
+
 def has_content(path: Path) -> bool:
     """Check if file exists and has content."""
     try:
@@ -28,38 +74,113 @@ def has_content(path: Path) -> bool:
         return False
 
 
+# Probe results by resolved path; persisted per directory inside probe_cache()
+_probe_entries: dict[str, ProbeEntry] = {}
+
+
 def get_video_duration(video_path: Path) -> float:
-    """Get video duration in seconds."""
+    """Get video duration in seconds.
+
+    Results are cached per path, modification time and size, so repeated lookups
+    of an unchanged file don't spawn another ffprobe (across runs too, when called
+    inside probe_cache()).
+    """
+    return _probe_entry(video_path).duration
+
+
+def get_video_fps(video_path: Path) -> float:
+    """Get video frame rate (cached together with the duration)."""
+    fps = _probe_entry(video_path, need_fps=True).fps
+    if fps is None:
+        raise SubprocessError(f"No video stream in {video_path.name}")
+    return fps
+
+
+def _probe_entry(video_path: Path, need_fps: bool = False) -> ProbeEntry:
+    """Cached probe result for video_path, probing again if the file changed."""
+    path = video_path.resolve()
+    st = path.stat()
+    entry = _probe_entries.get(str(path))
+    if (
+        entry is None
+        or entry.mtime_ns != st.st_mtime_ns
+        or entry.size != st.st_size
+        or (need_fps and entry.fps is None)
+    ):
+        duration, fps = _probe_file(str(path))
+        entry = ProbeEntry(mtime_ns=st.st_mtime_ns, size=st.st_size, duration=duration, fps=fps)
+        _probe_entries[str(path)] = entry
+    return entry
+
+
+@contextmanager
+def probe_cache(cache_path: Path) -> Iterator[None]:
+    """Load cached probe results from cache_path; save those for its directory on exit."""
+    directory = cache_path.parent.resolve()
+    if cache_path.exists():
+        try:
+            cached = ProbeCacheFile.load(cache_path).entries
+        except ValueError:
+            cached = {}  # corrupt or outdated cache, rebuilt on exit
+        for name, entry in cached.items():
+            _probe_entries.setdefault(str(directory / name), entry)
+    try:
+        yield
+    finally:
+        entries = {
+            Path(key).name: entry
+            for key, entry in _probe_entries.items()
+            if Path(key).parent == directory
+        }
+        ProbeCacheFile(entries=entries).save(cache_path)
+
+
+def _probe_file(path: str) -> tuple[float, float | None]:
+    """Run one ffprobe for the duration and first video stream's frame rate of path."""
     cmd = [
         "ffprobe",
         "-v",
         "error",
+        "-select_streams",
+        "v:0",
         "-show_entries",
-        "format=duration",
+        "format=duration:stream=r_frame_rate",
         "-of",
-        "default=noprint_wrappers=1:nokey=1",
-        str(video_path),
+        "json",
+        path,
     ]
     result = run_ffmpeg(cmd, check=True)
     try:
-        return float(result.stdout.strip())
-    except ValueError as e:
+        info = json.loads(result.stdout)
+        duration = float(info["format"]["duration"])
+    except (ValueError, KeyError, TypeError) as e:
         raise SubprocessError(f"Invalid duration from ffprobe: {result.stdout!r}") from e
 
+    # r_frame_rate is "30/1" or "30000/1001"
+    streams = info.get("streams") or [{}]
+    num, _, den = streams[0].get("r_frame_rate", "").partition("/")
+    try:
+        fps = float(num) / float(den or 1)
+    except (ValueError, ZeroDivisionError):
+        fps = None
+    return duration, fps
+
+
+# Zero-padded "00".."59" for the filename timestamp fast path
+_TWO_DIGITS = tuple(f"{i:02d}" for i in range(60))
+
 
 def format_time(seconds: float) -> str:
     """Format seconds as HH:MM:SS.mmm"""
-    hours = int(seconds // 3600)
-    minutes = int((seconds % 3600) // 60)
-    secs = seconds % 60
+    minutes, secs = divmod(seconds, 60)
+    hours, minutes = divmod(int(minutes), 60)
     return f"{hours:02d}:{minutes:02d}:{secs:06.3f}"
 
 
 def format_duration(seconds: float) -> str:
     """Format seconds as MM:SS or HH:MM:SS."""
-    hours = int(seconds // 3600)
-    minutes = int((seconds % 3600) // 60)
-    secs = int(seconds % 60)
+    minutes, secs = divmod(int(seconds), 60)
+    hours, minutes = divmod(minutes, 60)
     if hours > 0:
         return f"{hours}:{minutes:02d}:{secs:02d}"
     return f"{minutes}:{secs:02d}"
@@ -67,15 +188,25 @@ def format_duration(seconds: float) -> str:
 
 def format_time_filename(seconds: float) -> str:
     """Format seconds as filename-safe timestamp like 00h00m00s (always sortable)."""
-    hours = int(seconds // 3600)
-    minutes = int((seconds % 3600) // 60)
-    secs = int(seconds % 60)
-    return f"{hours:02d}h{minutes:02d}m{secs:02d}s"
+    return _format_whole_seconds(int(seconds))
+
+
+@lru_cache(maxsize=1024)
+def _format_whole_seconds(total: int) -> str:
+    # Clip names repeat the same boundary timestamps, so memoize on whole seconds
+    hours, rest = divmod(total, 3600)
+    minutes, secs = divmod(rest, 60)
+    hh = _TWO_DIGITS[hours] if hours < 60 else str(hours)
+    return f"{hh}h{_TWO_DIGITS[minutes]}m{_TWO_DIGITS[secs]}s"
 
 
 def get_default_workers() -> int:
-    """Get default worker count for ffmpeg operations."""
-    return min(os.cpu_count() or 4, 8)
+    """Get default worker count for ffmpeg operations (one per core)."""
+    return os.cpu_count() or 4
+
+
+# Timestamp format: 1h2m3s, 2m30s, 45s, etc.
+_TIMESTAMP_RE = re.compile(r"^(?:(\d+)h)?(?:(\d+)m)?(?:(\d+(?:\.\d+)?)s?)?$")
 
 
 def parse_timestamp(value: str) -> float:
@@ -85,15 +216,14 @@ def parse_timestamp(value: str) -> float:
       - Seconds as float: "47.5" → 47.5
       - Timestamp format: "47m40s" → 2860.0, "1h2m3s" → 3723.0
     """
-    # Try parsing as plain float first
-    try:
-        return float(value)
-    except ValueError:
-        pass
+    # Try parsing as plain float first, unless the unit suffix rules it out
+    if not value.endswith(("h", "m", "s")):
+        try:
+            return float(value)
+        except ValueError:
+            pass
 
-    # Parse timestamp format: 1h2m3s, 2m30s, 45s, etc.
-    pattern = r"^(?:(\d+)h)?(?:(\d+)m)?(?:(\d+(?:\.\d+)?)s?)?$"
-    match = re.match(pattern, value)
+    match = _TIMESTAMP_RE.match(value)
     if not match:
         raise ValueError(f"Invalid timestamp format: {value}")
 
@@ -104,8 +234,13 @@ def parse_timestamp(value: str) -> float:
     return hours * 3600 + minutes * 60 + seconds
 
 
-def get_video_fps(video_path: Path) -> float:
-    """Get video frame rate."""
+def get_keyframe_times(video_path: Path) -> list[float]:
+    """Get sorted keyframe timestamps of the first video stream.
+
+    Reads packet flags only, so no frames are decoded. Times are relative to the
+    container's start time (as cut times and ffmpeg's -ss are), which matters for
+    inputs like MPEG-TS that don't start at 0.
+    """
     cmd = [
         "ffprobe",
         "-v",
@@ -113,15 +248,21 @@ def get_video_fps(video_path: Path) -> float:
         "-select_streams",
         "v:0",
         "-show_entries",
-        "stream=r_frame_rate",
+        "packet=pts_time,flags:format=start_time",
         "-of",
-        "default=noprint_wrappers=1:nokey=1",
+        "csv",
         str(video_path),
     ]
     result = run_ffmpeg(cmd, check=True)
-    # r_frame_rate returns "30/1" or "30000/1001" format
-    fps_str = result.stdout.strip()
-    if "/" in fps_str:
-        num, den = fps_str.split("/")
-        return float(num) / float(den)
-    return float(fps_str)
+    start_time = 0.0
+    keyframes = []
+    for line in result.stdout.splitlines():
+        section, _, fields = line.partition(",")
+        if section == "format":
+            if fields not in ("", "N/A"):
+                start_time = float(fields)
+        elif section == "packet":
+            pts_time, _, flags = fields.partition(",")
+            if "K" in flags and pts_time not in ("", "N/A"):
+                keyframes.append(float(pts_time))
+    return sorted(t - start_time for t in keyframes)